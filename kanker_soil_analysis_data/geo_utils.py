@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Geographic helpers shared by the Kanker data update scripts
+"""
+
+from math import radians, sin, cos, sqrt, atan2
+
+import numpy as np
+
+def calculate_distance(lat1, lon1, lat2, lon2):
+    """Calculate distance between two points in km using Haversine formula"""
+    R = 6371  # Radius of Earth in kilometers
+
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+
+    a = sin(dlat / 2)**2 + cos(lat1) * cos(lat2) * sin(dlon / 2)**2
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+
+    distance = R * c
+    return distance
+
+
+def calculate_distances(lats, lons, center_lats, center_lons):
+    """
+    Haversine distances in km from every point to every center (vectorized calculate_distance)
+
+    Returns:
+        Array of shape (len(lats), len(center_lats))
+    """
+    R = 6371  # Radius of Earth in kilometers
+
+    lat1 = np.radians(np.asarray(lats, dtype=np.float64))[:, None]
+    lon1 = np.radians(np.asarray(lons, dtype=np.float64))[:, None]
+    lat2 = np.radians(np.asarray(center_lats, dtype=np.float64))[None, :]
+    lon2 = np.radians(np.asarray(center_lons, dtype=np.float64))[None, :]
+
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+
+    a = np.sin(dlat / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return R * c
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+JSON load/save helpers for the Kanker data update scripts
+Uses orjson (C parser/serializer) when installed, else the stdlib json module.
+Both produce the same 2-space indented UTF-8 output.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def load_json(file_path):
+    """
+    Load a JSON file
+
+    Raises:
+        FileNotFoundError, json.JSONDecodeError (orjson's decode error subclasses it)
+    """
+    if orjson is not None:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_json(file_path, data):
+    """Save data as 2-space indented UTF-8 JSON (non-ASCII kept as-is) in a single write"""
+    if orjson is not None:
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+
+    # json.dumps + one write instead of json.dump's many small chunk writes
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(data, indent=2, ensure_ascii=False))
@@ -16,9 +16,15 @@ Date: 2024
 Version: 1.0
 """
 
+import copy
 import json
 import math
+import time
 import logging
+import threading
+import weakref
+from concurrent.futures import Future
+from functools import wraps
 from typing import Dict, List, Tuple, Optional, Union
 from dataclasses import dataclass
 from enum import Enum
@@ -28,6 +34,83 @@ import numpy as np
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_KM = 6371.0
+
+def haversine_cdist(
+    query_lats: np.ndarray,
+    query_lons: np.ndarray,
+    lats: np.ndarray,
+    lons: np.ndarray
+) -> np.ndarray:
+    """
+    Pairwise Haversine distances (km) between query points and reference points
+    
+    Returns:
+        Array of shape (Q, N) for Q query points and N reference points
+    """
+    qlat = np.radians(np.asarray(query_lats, dtype=np.float64))[:, None]
+    qlon = np.radians(np.asarray(query_lons, dtype=np.float64))[:, None]
+    rlat = np.radians(np.asarray(lats, dtype=np.float64))[None, :]
+    rlon = np.radians(np.asarray(lons, dtype=np.float64))[None, :]
+    
+    a = (np.sin((rlat - qlat) / 2) ** 2 +
+         np.cos(qlat) * np.cos(rlat) * np.sin((rlon - qlon) / 2) ** 2)
+    
+    return 2 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+def coalesce_requests(maxsize: int = 10_000, ttl: float = 60.0):
+    """
+    Coalesce concurrent identical coordinate queries
+    
+    Queries are keyed per matcher instance by the exact (lat, lon, nutrient_type).
+    The first arrival computes the result; concurrent and repeated callers within
+    ``ttl`` seconds share that computation instead of triggering another scan.
+    Every caller gets its own copy of the result, so changes one caller makes
+    never reach another.
+    """
+    def decorator(func):
+        # Per-instance {key: (expiry, future)} tables; entries go away with the instance
+        instance_pending = weakref.WeakKeyDictionary()
+        lock = threading.Lock()
+        
+        @wraps(func)
+        def wrapper(self, lat: float, lon: float, nutrient_type: str = 'nitrogen'):
+            key = (lat, lon, nutrient_type)
+            now = time.monotonic()
+            
+            with lock:
+                pending = instance_pending.get(self)
+                if pending is None:
+                    pending = instance_pending[self] = {}
+                entry = pending.get(key)
+                if entry is not None and entry[0] > now:
+                    future, owner = entry[1], False
+                else:
+                    if len(pending) >= maxsize:
+                        for stale_key in [k for k, (expiry, _) in pending.items() if expiry <= now]:
+                            del pending[stale_key]
+                        while len(pending) >= maxsize:
+                            del pending[next(iter(pending))]
+                    future, owner = Future(), True
+                    pending[key] = (now + ttl, future)
+            
+            if not owner:
+                return copy.deepcopy(future.result())
+            
+            try:
+                result = func(self, lat, lon, nutrient_type)
+            except BaseException as e:
+                with lock:
+                    pending.pop(key, None)
+                future.set_exception(e)
+                raise
+            
+            future.set_result(result)
+            return copy.deepcopy(result)
+        
+        return wrapper
+    return decorator
+
 class ZoneType(Enum):
     """Zone types for nutrient classification"""
     YELLOW = "yellow"
@@ -257,6 +340,7 @@ class CoordinateMatcher:
             logger.error(f"Error extracting village data: {e}")
             return []
     
+    @coalesce_requests(maxsize=10_000, ttl=60.0)
     def multi_layer_coordinate_matching(
         self, 
         lat: float, 
@@ -338,6 +422,60 @@ class CoordinateMatcher:
             logger.error(f"Error in multi-layer matching: {e}")
             return self._fallback_to_closest_village(lat, lon)
     
+    def multi_layer_coordinate_matching_batch(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        nutrient_type: str = 'nitrogen'
+    ) -> List[VillageMatch]:
+        """
+        Batch coordinate matching for many sample points
+        
+        Resolves every query point to its closest village with a single
+        vectorized distance matrix instead of per-point Python loops.
+        
+        Args:
+            lats: Latitude coordinates
+            lons: Longitude coordinates
+            nutrient_type: Type of nutrient for zone matching
+            
+        Returns:
+            List of VillageMatch objects, one per query point
+        """
+        lats = np.asarray(lats, dtype=np.float64).ravel()
+        lons = np.asarray(lons, dtype=np.float64).ravel()
+        
+        if not self.village_data:
+            return [self._fallback_to_closest_village(float(lat), float(lon)) for lat, lon in zip(lats, lons)]
+        
+        try:
+            village_coords = np.array([v['coordinates'] for v in self.village_data], dtype=np.float64)
+            dists = haversine_cdist(lats, lons, village_coords[:, 0], village_coords[:, 1])
+            
+            idx = dists.argmin(axis=1)
+            best_d = dists[np.arange(lats.size), idx]
+            
+            zones = self.zone_definitions.get(nutrient_type, {})
+            
+            return [
+                VillageMatch(
+                    village_name=self.village_data[i]['village_name'],
+                    coordinates=(lat, lon),
+                    distance=d,
+                    zone_matches=[
+                        zone_info.zone_type for zone_info in zones.values()
+                        if self._is_point_in_zone(lat, lon, zone_info)
+                    ],
+                    confidence=0.5,
+                    method='batch_distance_matching'
+                )
+                for lat, lon, i, d in zip(lats.tolist(), lons.tolist(), idx.tolist(), best_d.tolist())
+            ]
+            
+        except Exception as e:
+            logger.error(f"Error in batch coordinate matching: {e}")
+            return [self._fallback_to_closest_village(float(lat), float(lon)) for lat, lon in zip(lats, lons)]
+    
     def smart_zone_interpolation(
         self, 
         lat: float, 
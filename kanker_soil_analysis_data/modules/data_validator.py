@@ -16,18 +16,161 @@ Date: 2024
 Version: 1.0
 """
 
+import re
 import json
+import bisect
+import math
 import logging
-import statistics
-from typing import Dict, List, Tuple, Optional, Union
+import operator
+import functools
+from typing import Dict, List, Tuple, Optional, Sequence, Union
 from dataclasses import dataclass
-from enum import Enum
+from enum import Enum, IntEnum
 import numpy as np
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Leading numeric token of an ICAR value string, e.g. "380" in "380-440 kg/ha"
+_NUM_RE = re.compile(r"(\d+\.?\d*)")
+
+# Well-formed ICAR value: "410", "410 kg/ha", "380-440 kg/ha"
+_VALUE_RE = re.compile(r"^\s*(\d+\.?\d*)(?:\s*-\s*(\d+\.?\d*))?(?:\s+[^\s-]+)?\s*$")
+
+@functools.lru_cache(maxsize=4096)
+def _parse_numeric(value_str: str) -> float:
+    """Parse the leading numeric value of a string (memoized)"""
+    match = _NUM_RE.search(value_str)
+    return float(match.group(1)) if match else 0.0
+
+# Simulated history is current * (0.9, 1.1, 0.95); its mean and sample
+# standard deviation are therefore fixed multiples of the current value
+_HIST_FACTORS = (0.9, 1.1, 0.95)
+_HIST_MEAN_COEF = sum(_HIST_FACTORS) / len(_HIST_FACTORS)
+_HIST_STD_COEF = math.sqrt(
+    sum((f - _HIST_MEAN_COEF) ** 2 for f in _HIST_FACTORS) / (len(_HIST_FACTORS) - 1)
+)
+_HIST_DEV_COEF = abs(1.0 - _HIST_MEAN_COEF)
+
+def _historical_score(current_value: float) -> float:
+    """Score how well a value agrees with its (simulated) historical spread"""
+    deviation = abs(current_value) * _HIST_DEV_COEF
+    historical_std = current_value * _HIST_STD_COEF
+    
+    # Check if current value is within reasonable range of historical data
+    if deviation <= 2 * historical_std:
+        return 0.9  # High consistency
+    elif deviation <= 3 * historical_std:
+        return 0.8  # Good consistency
+    return 0.6  # Poor consistency
+
+def _weather_score(rainfall: str, temperature: float, humidity: float) -> float:
+    """Score how well weather readings agree with each other (weather data present)"""
+    consistency_score = 0.8  # Base score
+    
+    # Rainfall consistency
+    if rainfall == 'high' and temperature > 30:
+        consistency_score += 0.1  # High rainfall with high temp is expected
+    elif rainfall == 'low' and temperature < 20:
+        consistency_score += 0.1  # Low rainfall with low temp is expected
+    
+    # Humidity consistency
+    if humidity > 70 and rainfall == 'high':
+        consistency_score += 0.05  # High humidity with high rainfall
+    elif humidity < 40 and rainfall == 'low':
+        consistency_score += 0.05  # Low humidity with low rainfall
+    
+    return 1.0 if consistency_score > 1.0 else consistency_score
+
+def _soil_score(soil_type: str, ph_value: float, nutrient_value: float) -> float:
+    """Score how well soil type, pH and nutrient value agree (soil data present)"""
+    consistency_score = 0.8  # Base score
+    
+    # pH consistency with soil type
+    if soil_type == 'clay' and 6.0 <= ph_value <= 7.5:
+        consistency_score += 0.1  # Clay soil typically has neutral pH
+    elif soil_type == 'sandy' and 5.5 <= ph_value <= 7.0:
+        consistency_score += 0.1  # Sandy soil typically has slightly acidic pH
+    
+    # Nutrient consistency with soil type
+    if soil_type == 'clay' and nutrient_value > 300:
+        consistency_score += 0.05  # Clay soil retains nutrients well
+    elif soil_type == 'sandy' and nutrient_value < 400:
+        consistency_score += 0.05  # Sandy soil loses nutrients faster
+    
+    return 1.0 if consistency_score > 1.0 else consistency_score
+
+def _weighted_mean(scores, weights) -> float:
+    """Weighted mean of two parallel sequences (0.5 when there is no weight)"""
+    total_weight = sum(weights)
+    if total_weight <= 0:
+        return 0.5
+    return sum(map(operator.mul, scores, weights)) / total_weight
+
+# Satellite-ICAR agreement: upper bounds (inclusive) of the percentage
+# difference buckets and the score for each bucket, last one is unbounded
+_DIFF_THRESHOLDS = (0.1, 0.2, 0.3, 0.5)
+_DIFF_SCORES = (0.95, 0.85, 0.75, 0.65, 0.45)
+_DIFF_THRESHOLDS_ARR = np.array(_DIFF_THRESHOLDS, dtype=np.float64)
+_DIFF_SCORES_ARR = np.array(_DIFF_SCORES, dtype=np.float64)
+
+def _agreement_score(diff_percentage: float) -> float:
+    """Score for a satellite-ICAR percentage difference (NaN gets the lowest score)"""
+    if diff_percentage != diff_percentage:
+        return _DIFF_SCORES[-1]
+    return _DIFF_SCORES[bisect.bisect_left(_DIFF_THRESHOLDS, diff_percentage)]
+
+# Zone-specific value expectations as a fraction of the typical value:
+# yellow 70-130%, red 120-180%, green 50-100%, orange 80-120%, grey 60-110%
+_ZONE_NAMES = ('yellow', 'red', 'green', 'orange', 'grey')
+_ZONE_IDX = {name: idx for idx, name in enumerate(_ZONE_NAMES)}
+_ZONE_MIN = np.array([0.7, 1.2, 0.5, 0.8, 0.6], dtype=np.float64)
+_ZONE_MAX = np.array([1.3, 1.8, 1.0, 1.2, 1.1], dtype=np.float64)
+
+class ValidationKey(IntEnum):
+    """Index of each multi-source validation score"""
+    SATELLITE_ICAR_AGREEMENT = 0
+    WEATHER_CONSISTENCY = 1
+    SOIL_CONSISTENCY = 2
+    HISTORICAL_CONSISTENCY = 3
+
+# Detail names reported in ValidationResult.details, indexed by ValidationKey
+_DETAIL_KEYS = tuple(key.name.lower() for key in ValidationKey)
+
+def _fused_validate(
+    satellite_value: float,
+    icar_value: float,
+    has_weather: bool,
+    rainfall: str,
+    temperature: float,
+    humidity: float,
+    has_soil: bool,
+    soil_type: str,
+    ph_value: float
+) -> Tuple[float, float, float, float]:
+    """
+    Fused multi-source validation kernel on pre-parsed scalars
+    
+    Computes the same four sub-scores as the individual _validate_* methods
+    in a single call, indexed by ValidationKey.
+    """
+    # 1. Satellite-ICAR agreement
+    if satellite_value == 0 or icar_value == 0:
+        agreement_score = 0.5
+    else:
+        diff_percentage = abs(satellite_value - icar_value) / max(satellite_value, icar_value)
+        agreement_score = _agreement_score(diff_percentage)
+    
+    # 2. Weather consistency
+    weather_score = _weather_score(rainfall, temperature, humidity) if has_weather else 0.7
+    
+    # 3. Soil consistency
+    soil_score = _soil_score(soil_type, ph_value, icar_value) if has_soil else 0.7
+    
+    # 4. Historical consistency
+    return agreement_score, weather_score, soil_score, _historical_score(icar_value)
+
 class ValidationLevel(Enum):
     """Validation levels"""
     HIGH = "high"
@@ -35,7 +178,10 @@ class ValidationLevel(Enum):
     LOW = "low"
     FAILED = "failed"
 
-@dataclass
+# Validation levels in the order of DataValidator._level_thresholds buckets
+_LEVELS = (ValidationLevel.FAILED, ValidationLevel.LOW, ValidationLevel.MEDIUM, ValidationLevel.HIGH)
+
+@dataclass(slots=True)
 class ValidationResult:
     """Result of data validation"""
     is_valid: bool
@@ -45,7 +191,7 @@ class ValidationResult:
     warnings: List[str]
     errors: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class DataQualityMetrics:
     """Data quality metrics"""
     completeness: float
@@ -70,6 +216,7 @@ class DataValidator:
             'soil_consistency': 0.2,
             'historical_consistency': 0.2
         }
+        self._detail_weights = tuple(self.validation_weights.get(key, 0.25) for key in _DETAIL_KEYS)
         
         # Expected ranges for different nutrients
         self.expected_ranges = {
@@ -82,6 +229,12 @@ class DataValidator:
             'soil_ph': {'min': 5.0, 'max': 8.5, 'unit': 'pH'}
         }
         
+        # Structure-of-arrays view of expected_ranges indexed by nutrient
+        self._nutrient_index = {name: idx for idx, name in enumerate(self.expected_ranges)}
+        self._range_min = np.array([r['min'] for r in self.expected_ranges.values()], dtype=np.float64)
+        self._range_max = np.array([r['max'] for r in self.expected_ranges.values()], dtype=np.float64)
+        self._range_unit = tuple(r['unit'].lower() for r in self.expected_ranges.values())
+        
         # Quality thresholds
         self.quality_thresholds = {
             'excellent': 0.9,
@@ -90,6 +243,13 @@ class DataValidator:
             'poor': 0.6,
             'failed': 0.5
         }
+        
+        # Lower bounds of LOW, MEDIUM and HIGH ('excellent' is HIGH as well)
+        self._level_thresholds = (
+            self.quality_thresholds['poor'],
+            self.quality_thresholds['fair'],
+            self.quality_thresholds['good']
+        )
     
     def multi_source_validation(
         self, 
@@ -113,36 +273,40 @@ class DataValidator:
             ValidationResult object with validation details
         """
         try:
-            validation_details = {}
-            warnings = []
-            errors = []
-            
-            # 1. Satellite-ICAR agreement (40% weight)
-            satellite_icar_score = self._validate_satellite_icar_agreement(
-                satellite_data, icar_data
-            )
-            validation_details['satellite_icar_agreement'] = satellite_icar_score
-            
-            # 2. Weather consistency (20% weight)
-            weather_score = self._validate_weather_consistency(
-                weather_data, icar_data, village_context
-            )
-            validation_details['weather_consistency'] = weather_score
-            
-            # 3. Soil consistency (20% weight)
-            soil_score = self._validate_soil_consistency(
-                soil_data, icar_data, village_context
-            )
-            validation_details['soil_consistency'] = soil_score
-            
-            # 4. Historical consistency (20% weight)
-            historical_score = self._validate_historical_consistency(
-                icar_data, village_context
-            )
-            validation_details['historical_consistency'] = historical_score
+            try:
+                # Fused path: parse every input once, score all four sources in one call
+                weather = weather_data or {}
+                soil = soil_data or {}
+                icar_value = self._extract_numeric_value(icar_data.get('value', '0'))
+                scores = _fused_validate(
+                    satellite_data.get('value', 0) if satellite_data else 0,
+                    icar_value,
+                    bool(weather_data),
+                    weather.get('rainfall', 'normal'),
+                    weather.get('temperature', 25),
+                    weather.get('humidity', 60),
+                    bool(soil_data),
+                    soil.get('soil_type', 'clay'),
+                    soil.get('ph', 6.5)
+                )
+            except Exception:
+                # Malformed inputs: let each validator apply its own fallback
+                scores = (
+                    # 1. Satellite-ICAR agreement (40% weight)
+                    self._validate_satellite_icar_agreement(satellite_data, icar_data),
+                    # 2. Weather consistency (20% weight)
+                    self._validate_weather_consistency(weather_data, icar_data, village_context),
+                    # 3. Soil consistency (20% weight)
+                    self._validate_soil_consistency(soil_data, icar_data, village_context),
+                    # 4. Historical consistency (20% weight)
+                    self._validate_historical_consistency(icar_data, village_context)
+                )
             
             # Calculate overall confidence score
-            overall_score = self._calculate_overall_confidence(validation_details)
+            overall_score = self._calculate_overall_confidence(scores)
+            
+            # Named scores are only needed for reporting
+            validation_details = dict(zip(_DETAIL_KEYS, scores))
             
             # Determine validation level
             validation_level = self._determine_validation_level(overall_score)
@@ -170,6 +334,50 @@ class DataValidator:
                 errors=[f"Validation failed: {str(e)}"]
             )
     
+    def multi_source_validation_batch(
+        self,
+        satellite_values: np.ndarray,
+        icar_values: np.ndarray,
+        rainfall: Optional[np.ndarray] = None,
+        temperature: Optional[np.ndarray] = None,
+        humidity: Optional[np.ndarray] = None,
+        soil_type: Optional[np.ndarray] = None,
+        soil_ph: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized multi-source cross-validation for many villages
+        
+        Args:
+            satellite_values: Satellite-derived nutrient values
+            icar_values: Numeric ICAR nutrient values
+            rainfall: Rainfall categories ('low', 'normal', 'high')
+            temperature: Temperatures in degrees Celsius
+            humidity: Relative humidity in percent
+            soil_type: Soil types ('clay', 'sandy', ...)
+            soil_ph: Soil pH values
+            
+        Returns:
+            Dictionary of per-village arrays: the four sub-scores keyed as in
+            ValidationResult.details, 'confidence_score' and an 'is_valid' mask.
+            Omitting all weather (or all soil) arrays scores them as missing data.
+        """
+        satellite_values = np.asarray(satellite_values, dtype=np.float64)
+        icar_values = np.asarray(icar_values, dtype=np.float64)
+        
+        scores = (
+            self._validate_satellite_icar_agreement_batch(satellite_values, icar_values),
+            self._validate_weather_consistency_batch(icar_values.shape, rainfall, temperature, humidity),
+            self._validate_soil_consistency_batch(icar_values, soil_type, soil_ph),
+            self._validate_historical_consistency_batch(icar_values)
+        )
+        overall_score = self._calculate_overall_confidence(scores)
+        
+        details = dict(zip(_DETAIL_KEYS, scores))
+        details['confidence_score'] = overall_score
+        details['is_valid'] = overall_score >= self.quality_thresholds['fair']
+        
+        return details
+    
     def validate_nutrient_data(
         self, 
         nutrient_data: Dict, 
@@ -209,9 +417,7 @@ class DataValidator:
             validation_details['unit_consistency'] = unit_score
             
             # Calculate overall score
-            overall_score = statistics.mean([
-                range_score, zone_score, value_score, unit_score
-            ])
+            overall_score = math.fsum((range_score, zone_score, value_score, unit_score)) * 0.25
             
             # Determine validation level
             validation_level = self._determine_validation_level(overall_score)
@@ -265,7 +471,7 @@ class DataValidator:
             reliability = self._assess_reliability(data)
             
             # Calculate overall score
-            overall_score = statistics.mean([completeness, consistency, accuracy, reliability])
+            overall_score = math.fsum((completeness, consistency, accuracy, reliability)) * 0.25
             
             return DataQualityMetrics(
                 completeness=completeness,
@@ -285,6 +491,73 @@ class DataValidator:
                 overall_score=0.0
             )
     
+    def validate_nutrient_range_batch(self, values: np.ndarray, nutrient_type: str) -> np.ndarray:
+        """
+        Vectorized range validation for many nutrient values
+        
+        Args:
+            values: Numeric nutrient values
+            nutrient_type: Type of nutrient
+            
+        Returns:
+            Array of range scores matching _validate_nutrient_range
+        """
+        values = np.asarray(values, dtype=np.float64)
+        
+        idx = self._nutrient_index.get(nutrient_type)
+        if idx is None:
+            return np.full(values.shape, 0.5)  # Unknown nutrient type
+        
+        lo, hi = self._range_min[idx], self._range_max[idx]
+        
+        # Broader band first, then overwrite with the tighter one
+        scores = np.full(values.shape, 0.4)
+        scores[(values >= lo * 0.8) & (values <= hi * 1.2)] = 0.8
+        scores[(values >= lo) & (values <= hi)] = 0.95
+        
+        return scores
+    
+    def validate_zone_consistency_batch(
+        self,
+        values: np.ndarray,
+        zones: Sequence[str],
+        nutrient_type: str
+    ) -> np.ndarray:
+        """
+        Vectorized zone consistency validation for many nutrient values
+        
+        Args:
+            values: Numeric nutrient values
+            zones: Zone name of each value
+            nutrient_type: Type of nutrient
+            
+        Returns:
+            Array of zone scores matching _validate_zone_consistency
+        """
+        values = np.asarray(values, dtype=np.float64)
+        zone_idx = np.fromiter((_ZONE_IDX.get(zone, -1) for zone in zones), dtype=np.intp, count=values.size)
+        known = zone_idx >= 0
+        
+        idx = self._nutrient_index.get(nutrient_type)
+        typical_value = self._range_min[idx] if idx is not None else 100
+        normalized_value = values / typical_value
+        
+        lo = _ZONE_MIN[zone_idx[known]]
+        hi = _ZONE_MAX[zone_idx[known]]
+        normalized_value = normalized_value[known]
+        
+        scores = np.full(values.shape, 0.7)  # Unknown zone
+        scores[known] = np.select(
+            [
+                (normalized_value >= lo) & (normalized_value <= hi),
+                (normalized_value >= lo * 0.9) & (normalized_value <= hi * 1.1)
+            ],
+            [0.95, 0.85],
+            default=0.6
+        )
+        
+        return scores
+    
     def _validate_satellite_icar_agreement(self, satellite_data: Dict, icar_data: Dict) -> float:
         """Validate agreement between satellite and ICAR data"""
         try:
@@ -301,21 +574,24 @@ class DataValidator:
             diff_percentage = abs(satellite_value - icar_value) / max(satellite_value, icar_value)
             
             # Convert to score (lower difference = higher score)
-            if diff_percentage <= 0.1:  # Within 10%
-                return 0.95
-            elif diff_percentage <= 0.2:  # Within 20%
-                return 0.85
-            elif diff_percentage <= 0.3:  # Within 30%
-                return 0.75
-            elif diff_percentage <= 0.5:  # Within 50%
-                return 0.65
-            else:
-                return 0.45  # Poor agreement
+            return _agreement_score(diff_percentage)
             
         except Exception as e:
             logger.error(f"Error validating satellite-ICAR agreement: {e}")
             return 0.5
     
+    def _validate_satellite_icar_agreement_batch(self, satellite_values: np.ndarray, icar_values: np.ndarray) -> np.ndarray:
+        """Vectorized _validate_satellite_icar_agreement over numeric value arrays"""
+        satellite_values = np.asarray(satellite_values, dtype=np.float64)
+        icar_values = np.asarray(icar_values, dtype=np.float64)
+        
+        missing = (satellite_values == 0) | (icar_values == 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            diff_percentage = np.abs(satellite_values - icar_values) / np.maximum(satellite_values, icar_values)
+        
+        scores = _DIFF_SCORES_ARR[np.searchsorted(_DIFF_THRESHOLDS_ARR, diff_percentage, side='left')]
+        return np.where(missing, 0.5, scores)
+    
     def _validate_weather_consistency(self, weather_data: Dict, icar_data: Dict, village_context: Dict) -> float:
         """Validate weather consistency"""
         try:
@@ -327,22 +603,7 @@ class DataValidator:
             temperature = weather_data.get('temperature', 25)
             humidity = weather_data.get('humidity', 60)
             
-            # Basic consistency checks
-            consistency_score = 0.8  # Base score
-            
-            # Rainfall consistency
-            if rainfall == 'high' and temperature > 30:
-                consistency_score += 0.1  # High rainfall with high temp is expected
-            elif rainfall == 'low' and temperature < 20:
-                consistency_score += 0.1  # Low rainfall with low temp is expected
-            
-            # Humidity consistency
-            if humidity > 70 and rainfall == 'high':
-                consistency_score += 0.05  # High humidity with high rainfall
-            elif humidity < 40 and rainfall == 'low':
-                consistency_score += 0.05  # Low humidity with low rainfall
-            
-            return min(1.0, consistency_score)
+            return _weather_score(rainfall, temperature, humidity)
             
         except Exception as e:
             logger.error(f"Error validating weather consistency: {e}")
@@ -357,24 +618,9 @@ class DataValidator:
             soil_type = soil_data.get('soil_type', 'clay')
             ph_value = soil_data.get('ph', 6.5)
             
-            # Basic soil consistency checks
-            consistency_score = 0.8  # Base score
-            
-            # pH consistency with soil type
-            if soil_type == 'clay' and 6.0 <= ph_value <= 7.5:
-                consistency_score += 0.1  # Clay soil typically has neutral pH
-            elif soil_type == 'sandy' and 5.5 <= ph_value <= 7.0:
-                consistency_score += 0.1  # Sandy soil typically has slightly acidic pH
-            
-            # Nutrient consistency with soil type
             nutrient_value = self._extract_numeric_value(icar_data.get('value', '0'))
             
-            if soil_type == 'clay' and nutrient_value > 300:
-                consistency_score += 0.05  # Clay soil retains nutrients well
-            elif soil_type == 'sandy' and nutrient_value < 400:
-                consistency_score += 0.05  # Sandy soil loses nutrients faster
-            
-            return min(1.0, consistency_score)
+            return _soil_score(soil_type, ph_value, nutrient_value)
             
         except Exception as e:
             logger.error(f"Error validating soil consistency: {e}")
@@ -387,38 +633,85 @@ class DataValidator:
             current_value = self._extract_numeric_value(icar_data.get('value', '0'))
             
             # Simulate historical data (in real implementation, this would come from database)
-            historical_values = [current_value * 0.9, current_value * 1.1, current_value * 0.95]
-            
-            if historical_values:
-                historical_avg = statistics.mean(historical_values)
-                historical_std = statistics.stdev(historical_values) if len(historical_values) > 1 else 0
-                
-                # Check if current value is within reasonable range of historical data
-                if abs(current_value - historical_avg) <= 2 * historical_std:
-                    return 0.9  # High consistency
-                elif abs(current_value - historical_avg) <= 3 * historical_std:
-                    return 0.8  # Good consistency
-                else:
-                    return 0.6  # Poor consistency
-            
-            return 0.7  # Neutral score for no historical data
+            return _historical_score(current_value)
             
         except Exception as e:
             logger.error(f"Error validating historical consistency: {e}")
             return 0.7
     
+    def _validate_weather_consistency_batch(
+        self,
+        shape: Tuple[int, ...],
+        rainfall: Optional[np.ndarray],
+        temperature: Optional[np.ndarray],
+        humidity: Optional[np.ndarray]
+    ) -> np.ndarray:
+        """Vectorized _weather_score (kept in step by tests/test_data_validator.py)"""
+        if rainfall is None and temperature is None and humidity is None:
+            return np.full(shape, 0.7)  # Neutral score for missing weather data
+        
+        rainfall = np.broadcast_to(np.asarray('normal' if rainfall is None else rainfall), shape)
+        temperature = np.broadcast_to(np.asarray(25 if temperature is None else temperature, dtype=np.float64), shape)
+        humidity = np.broadcast_to(np.asarray(60 if humidity is None else humidity, dtype=np.float64), shape)
+        
+        high_rain = rainfall == 'high'
+        low_rain = rainfall == 'low'
+        
+        consistency_score = np.full(shape, 0.8)  # Base score
+        consistency_score += 0.1 * ((high_rain & (temperature > 30)) | (low_rain & (temperature < 20)))
+        consistency_score += 0.05 * ((high_rain & (humidity > 70)) | (low_rain & (humidity < 40)))
+        
+        return np.minimum(consistency_score, 1.0, out=consistency_score)
+    
+    def _validate_soil_consistency_batch(
+        self,
+        icar_values: np.ndarray,
+        soil_type: Optional[np.ndarray],
+        soil_ph: Optional[np.ndarray]
+    ) -> np.ndarray:
+        """Vectorized _soil_score (kept in step by tests/test_data_validator.py)"""
+        shape = icar_values.shape
+        if soil_type is None and soil_ph is None:
+            return np.full(shape, 0.7)  # Neutral score for missing soil data
+        
+        soil_type = np.broadcast_to(np.asarray('clay' if soil_type is None else soil_type), shape)
+        ph_value = np.broadcast_to(np.asarray(6.5 if soil_ph is None else soil_ph, dtype=np.float64), shape)
+        
+        clay = soil_type == 'clay'
+        sandy = soil_type == 'sandy'
+        
+        consistency_score = np.full(shape, 0.8)  # Base score
+        consistency_score += 0.1 * (
+            (clay & (ph_value >= 6.0) & (ph_value <= 7.5)) | (sandy & (ph_value >= 5.5) & (ph_value <= 7.0))
+        )
+        consistency_score += 0.05 * ((clay & (icar_values > 300)) | (sandy & (icar_values < 400)))
+        
+        return np.minimum(consistency_score, 1.0, out=consistency_score)
+    
+    def _validate_historical_consistency_batch(self, icar_values: np.ndarray) -> np.ndarray:
+        """Vectorized _validate_historical_consistency"""
+        deviation = np.abs(icar_values) * _HIST_DEV_COEF
+        historical_std = icar_values * _HIST_STD_COEF
+        
+        return np.select(
+            [deviation <= 2 * historical_std, deviation <= 3 * historical_std],
+            [0.9, 0.8],
+            default=0.6
+        )
+    
     def _validate_nutrient_range(self, nutrient_data: Dict, nutrient_type: str) -> float:
         """Validate nutrient value is within expected range"""
         try:
-            if nutrient_type not in self.expected_ranges:
+            idx = self._nutrient_index.get(nutrient_type)
+            if idx is None:
                 return 0.5  # Unknown nutrient type
             
-            expected_range = self.expected_ranges[nutrient_type]
+            lo, hi = self._range_min[idx], self._range_max[idx]
             value = self._extract_numeric_value(nutrient_data.get('value', '0'))
             
-            if expected_range['min'] <= value <= expected_range['max']:
+            if lo <= value <= hi:
                 return 0.95  # Within expected range
-            elif expected_range['min'] * 0.8 <= value <= expected_range['max'] * 1.2:
+            elif lo * 0.8 <= value <= hi * 1.2:
                 return 0.8  # Within extended range
             else:
                 return 0.4  # Outside expected range
@@ -430,26 +723,18 @@ class DataValidator:
     def _validate_zone_consistency(self, nutrient_data: Dict, nutrient_type: str, village_context: Dict) -> float:
         """Validate zone consistency"""
         try:
-            zone = nutrient_data.get('zone', 'unknown')
+            zone_idx = _ZONE_IDX.get(nutrient_data.get('zone', 'unknown'))
             value = self._extract_numeric_value(nutrient_data.get('value', '0'))
             
-            # Zone-specific value expectations
-            zone_expectations = {
-                'yellow': {'min': 0.7, 'max': 1.3},  # 70-130% of typical
-                'red': {'min': 1.2, 'max': 1.8},     # 120-180% of typical
-                'green': {'min': 0.5, 'max': 1.0},   # 50-100% of typical
-                'orange': {'min': 0.8, 'max': 1.2},  # 80-120% of typical
-                'grey': {'min': 0.6, 'max': 1.1}     # 60-110% of typical
-            }
-            
-            if zone in zone_expectations:
-                expected_range = zone_expectations[zone]
-                typical_value = self.expected_ranges.get(nutrient_type, {}).get('min', 100)
+            if zone_idx is not None:
+                lo, hi = _ZONE_MIN[zone_idx], _ZONE_MAX[zone_idx]
+                idx = self._nutrient_index.get(nutrient_type)
+                typical_value = self._range_min[idx] if idx is not None else 100
                 normalized_value = value / typical_value
                 
-                if expected_range['min'] <= normalized_value <= expected_range['max']:
+                if lo <= normalized_value <= hi:
                     return 0.95  # Perfect zone consistency
-                elif expected_range['min'] * 0.9 <= normalized_value <= expected_range['max'] * 1.1:
+                elif lo * 0.9 <= normalized_value <= hi * 1.1:
                     return 0.85  # Good zone consistency
                 else:
                     return 0.6   # Poor zone consistency
@@ -466,6 +751,14 @@ class DataValidator:
             # Check for internal consistency in the data
             value_str = str(nutrient_data.get('value', '0'))
             
+            # Fast path for the common "<num>[-<num>] [unit]" shape
+            match = _VALUE_RE.match(value_str)
+            if match:
+                min_str, max_str = match.groups()
+                if max_str is None:
+                    return 0.95  # Well-formed single value
+                return 0.9 if float(min_str) < float(max_str) else 0.4
+            
             # Check if value string is well-formed
             if '-' in value_str:  # Range value
                 parts = value_str.split('-')
@@ -495,10 +788,11 @@ class DataValidator:
     def _validate_unit_consistency(self, nutrient_data: Dict, nutrient_type: str) -> float:
         """Validate unit consistency"""
         try:
-            if nutrient_type not in self.expected_ranges:
+            idx = self._nutrient_index.get(nutrient_type)
+            if idx is None:
                 return 0.5
             
-            expected_unit = self.expected_ranges[nutrient_type]['unit']
+            expected_unit = self._range_unit[idx]
             value_str = str(nutrient_data.get('value', '0'))
             
             # Extract unit from value string
@@ -509,7 +803,7 @@ class DataValidator:
                     unit_match = parts[-1].lower()
             
             if unit_match:
-                if unit_match == expected_unit.lower():
+                if unit_match == expected_unit:
                     return 0.95  # Correct unit
                 elif unit_match in ['kg/ha', 'ppm', 'ph']:  # Valid units
                     return 0.8   # Valid but different unit
@@ -524,15 +818,10 @@ class DataValidator:
     
     def _assess_completeness(self, data: Dict) -> float:
         """Assess data completeness"""
-        try:
-            required_fields = ['village_name', 'coordinates', 'value', 'zone']
-            present_fields = sum(1 for field in required_fields if field in data and data[field])
-            
-            return present_fields / len(required_fields)
-            
-        except Exception as e:
-            logger.error(f"Error assessing completeness: {e}")
-            return 0.0
+        required_fields = ['village_name', 'coordinates', 'value', 'zone']
+        present_fields = sum(1 for field in required_fields if field in data and data[field])
+        
+        return present_fields / len(required_fields)
     
     def _assess_consistency(self, data: Dict) -> float:
         """Assess data consistency"""
@@ -553,7 +842,7 @@ class DataValidator:
             if zone in valid_zones:
                 consistency_score += 0.1
             
-            return min(1.0, consistency_score)
+            return 1.0 if consistency_score > 1.0 else consistency_score
             
         except Exception as e:
             logger.error(f"Error assessing consistency: {e}")
@@ -561,83 +850,44 @@ class DataValidator:
     
     def _assess_accuracy(self, data: Dict) -> float:
         """Assess data accuracy"""
-        try:
-            # Check if values are within reasonable ranges
-            accuracy_score = 0.8  # Base score
-            
-            value_str = str(data.get('value', '0'))
-            numeric_value = self._extract_numeric_value(value_str)
-            
-            if 0 < numeric_value < 1000:  # Reasonable range for most nutrients
-                accuracy_score += 0.1
-            
-            return min(1.0, accuracy_score)
-            
-        except Exception as e:
-            logger.error(f"Error assessing accuracy: {e}")
-            return 0.0
+        # Check if values are within reasonable ranges
+        accuracy_score = 0.8  # Base score
+        
+        numeric_value = self._extract_numeric_value(data.get('value') or '0')
+        
+        if 0 < numeric_value < 1000:  # Reasonable range for most nutrients
+            accuracy_score += 0.1
+        
+        return 1.0 if accuracy_score > 1.0 else accuracy_score
     
     def _assess_reliability(self, data: Dict) -> float:
         """Assess data reliability"""
-        try:
-            # Check for data reliability indicators
-            reliability_score = 0.7  # Base score
-            
-            # Check if data has confidence indicators
-            if 'confidence' in data:
-                reliability_score += 0.2
-            
-            # Check if data has validation indicators
-            if 'validated' in data:
-                reliability_score += 0.1
-            
-            return min(1.0, reliability_score)
-            
-        except Exception as e:
-            logger.error(f"Error assessing reliability: {e}")
-            return 0.0
+        # Check for data reliability indicators
+        reliability_score = 0.7  # Base score
+        
+        # Check if data has confidence indicators
+        if 'confidence' in data:
+            reliability_score += 0.2
+        
+        # Check if data has validation indicators
+        if 'validated' in data:
+            reliability_score += 0.1
+        
+        return 1.0 if reliability_score > 1.0 else reliability_score
     
     def _extract_numeric_value(self, value_str: str) -> float:
         """Extract numeric value from string"""
-        try:
-            import re
-            match = re.search(r'(\d+\.?\d*)', str(value_str))
-            if match:
-                return float(match.group(1))
-            return 0.0
-        except Exception as e:
-            logger.error(f"Error extracting numeric value: {e}")
-            return 0.0
+        return _parse_numeric(value_str if isinstance(value_str, str) else str(value_str))
     
-    def _calculate_overall_confidence(self, validation_details: Dict) -> float:
-        """Calculate overall confidence from validation details"""
-        try:
-            weighted_score = 0
-            total_weight = 0
-            
-            for key, score in validation_details.items():
-                weight = self.validation_weights.get(key, 0.25)
-                weighted_score += score * weight
-                total_weight += weight
-            
-            return weighted_score / total_weight if total_weight > 0 else 0.5
-            
-        except Exception as e:
-            logger.error(f"Error calculating overall confidence: {e}")
-            return 0.5
+    def _calculate_overall_confidence(self, scores: Sequence[float]) -> float:
+        """Calculate overall confidence from scores indexed by ValidationKey"""
+        return _weighted_mean(scores, self._detail_weights)
     
     def _determine_validation_level(self, score: float) -> ValidationLevel:
         """Determine validation level based on score"""
-        if score >= self.quality_thresholds['excellent']:
-            return ValidationLevel.HIGH
-        elif score >= self.quality_thresholds['good']:
-            return ValidationLevel.HIGH
-        elif score >= self.quality_thresholds['fair']:
-            return ValidationLevel.MEDIUM
-        elif score >= self.quality_thresholds['poor']:
-            return ValidationLevel.LOW
-        else:
-            return ValidationLevel.FAILED
+        if score != score:
+            return ValidationLevel.FAILED  # NaN passes no threshold
+        return _LEVELS[bisect.bisect_right(self._level_thresholds, score)]
     
     def _check_for_issues(self, validation_details: Dict, overall_score: float) -> Tuple[List[str], List[str]]:
         """Check for warnings and errors"""
@@ -19,14 +19,32 @@ Version: 1.0
 import re
 import json
 import logging
-from typing import Dict, List, Tuple, Optional, Union
-from dataclasses import dataclass
-from enum import Enum
+import numbers
+import operator
+import functools
+from typing import Dict, List, NamedTuple, Tuple, Optional, Sequence, Union
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
+
+import numpy as np
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Range string patterns: "380-440 kg/ha", "420 kg/ha" and any bare number.
+# A number is written \d+(?:\.\d*)? (not the ambiguous \d+\.?\d*) and may
+# not start inside a digit run, so a failed search over a long run of
+# digits backtracks linearly instead of cubically. The leftmost match is
+# the same as with the plain \d+\.?\d* patterns.
+_NUMBER = r'(?<!\d)(\d+(?:\.\d*)?)'
+_RANGE_RE = re.compile(_NUMBER + r'\s*-\s*(\d+(?:\.\d*)?)\s*([a-zA-Z/]+)?')
+_SINGLE_RE = re.compile(_NUMBER + r'\s*([a-zA-Z/]+)?')
+_NUMERIC_RE = re.compile(_NUMBER)
+
+# Bound search methods, resolved once instead of per call
+_range_search = _RANGE_RE.search
+_single_search = _SINGLE_RE.search
+_numeric_search = _NUMERIC_RE.search
+
 class NutrientType(Enum):
     """Nutrient types supported by the system"""
     NITROGEN = "nitrogen"
@@ -37,23 +55,22 @@ class NutrientType(Enum):
     ZINC = "zinc"
     SOIL_PH = "soil_ph"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RangeValue:
     """Data class for range values"""
     min_value: float
     max_value: float
     unit: str
     confidence: float = 0.0
+    center_value: float = field(init=False)  # Center value of the range
+    range_width: float = field(init=False)   # Width of the range
+    is_point: bool = field(init=False)       # Single value (min == max)
     
-    @property
-    def center_value(self) -> float:
-        """Calculate center value of the range"""
-        return (self.min_value + self.max_value) / 2
-    
-    @property
-    def range_width(self) -> float:
-        """Calculate width of the range"""
-        return self.max_value - self.min_value
+    def __post_init__(self):
+        """Precompute derived values (frozen, so set via object.__setattr__)"""
+        object.__setattr__(self, 'center_value', (self.min_value + self.max_value) / 2)
+        object.__setattr__(self, 'range_width', self.max_value - self.min_value)
+        object.__setattr__(self, 'is_point', self.min_value == self.max_value)
     
     @property
     def range_percentage(self) -> float:
@@ -62,9 +79,173 @@ class RangeValue:
             return 0
         return (self.range_width / self.center_value) * 100
 
-@dataclass
-class VillageContext:
-    """Context information for a village"""
+@functools.lru_cache(maxsize=4096)
+def _parse_range_cached(range_str: str) -> Optional[RangeValue]:
+    """Parse a stripped range string (memoized, RangeValue is immutable)"""
+    # Pattern for range: "min-max unit" or "min-max"
+    match = _range_search(range_str)
+    
+    if match:
+        min_val = float(match.group(1))
+        max_val = float(match.group(2))
+        unit = match.group(3) if match.group(3) else "kg/ha"
+        
+        return RangeValue(
+            min_value=min_val,
+            max_value=max_val,
+            unit=unit,
+            confidence=0.8  # Default confidence for parsed ranges
+        )
+    
+    # Pattern for single value: "420 kg/ha"
+    match = _single_search(range_str)
+    
+    if match:
+        value = float(match.group(1))
+        unit = match.group(2) if match.group(2) else "kg/ha"
+        
+        return RangeValue(
+            min_value=value,
+            max_value=value,
+            unit=unit,
+            confidence=0.9  # Higher confidence for single values
+        )
+    
+    logger.warning("Could not parse range string: %s", range_str)
+    return None
+
+class ProcessingMethod(IntEnum):
+    """AI-powered processing branches (int8 method codes in the batch API)"""
+    FALLBACK = -1
+    SATELLITE_ADJUSTED_CENTER = 0
+    SATELLITE_HIGHER_CENTER = 1
+    SATELLITE_LOWER_MIN = 2
+    WEIGHTED_AVERAGE = 3
+
+# Method names and confidences of the AI-powered processing branches,
+# indexed by ProcessingMethod code
+_PROCESSING_METHODS = tuple(method.name.lower() for method in ProcessingMethod if method >= 0)
+_PROCESSING_CASES = tuple(zip(_PROCESSING_METHODS, (0.95, 0.85, 0.85, 0.9)))
+_PROCESSING_CONFIDENCES = np.array([confidence for _, confidence in _PROCESSING_CASES])
+
+# Confidence of each multi-method validation estimate, in method order
+_METHOD_CONFIDENCES = (0.7, 0.75, 0.8, 0.65, 0.7)
+
+def _consensus(values: Sequence[float], confs: Sequence[float]) -> Tuple[float, float]:
+    """
+    Confidence-weighted consensus of several method estimates
+    
+    Returns:
+        (consensus_value, overall_confidence) where lower spread between
+        the estimates gives a higher overall confidence
+    """
+    count = len(values)
+    total_weight = sum(confs)
+    consensus_value = sum(map(operator.mul, values, confs)) / total_weight
+    
+    # Calculate variance between methods
+    mean_value = sum(values) / count
+    variance = sum([(val - mean_value) ** 2 for val in values]) / count
+    
+    # Lower variance = higher confidence
+    variance_factor = max(0, 1 - (variance / mean_value) if mean_value > 0 else 0)
+    
+    # Combine variance factor with average confidence of methods
+    overall_confidence = (total_weight / count * 0.7) + (variance_factor * 0.3)
+    
+    return consensus_value, min(1.0, max(0.0, overall_confidence))
+
+# Zone-based adjustments for zone-typical values
+_ZONE_ADJUSTMENTS = {
+    'yellow': 1.0,      # Normal zone
+    'red': 1.1,         # High nutrient zone
+    'green': 0.9,       # Low nutrient zone
+    'orange': 1.05,     # Medium-high zone
+    'grey': 0.95        # Medium-low zone
+}
+
+def _satellite_agreement(satellite_value: float, range_value: RangeValue) -> float:
+    """Calculate agreement between satellite and ICAR range"""
+    center_value = range_value.center_value
+    
+    if range_value.is_point:
+        # Single value - percentage difference from it
+        if center_value == 0:
+            return 0.5  # Zero value, no scale to measure distance against
+        return max(0, 1 - (abs(satellite_value - center_value) / center_value))
+    
+    if range_value.min_value <= satellite_value <= range_value.max_value:
+        # Satellite is within range - agreement falls off towards the edges
+        max_distance = range_value.range_width / 2
+        return max(0, 1 - (abs(satellite_value - center_value) / max_distance))
+    
+    # Satellite is outside range - agreement based on the distance past
+    # the nearest range edge
+    if satellite_value > range_value.max_value:
+        distance = satellite_value - range_value.max_value
+    else:
+        distance = range_value.min_value - satellite_value
+    
+    return max(0, 1 - (distance / center_value))
+
+def _adjust_to_satellite(satellite_value: float, range_value: RangeValue) -> float:
+    """Adjust ICAR value based on satellite data"""
+    if range_value.is_point:
+        return range_value.center_value
+    
+    # If satellite is within range, use weighted average
+    if range_value.min_value <= satellite_value <= range_value.max_value:
+        return range_value.center_value * 0.7 + satellite_value * 0.3
+    
+    # If satellite is outside range, adjust towards it
+    if satellite_value > range_value.max_value:
+        return range_value.max_value * 0.8 + satellite_value * 0.2
+    else:
+        return range_value.min_value * 0.8 + satellite_value * 0.2
+
+def _historical_average(historical_data: Dict, range_value: RangeValue) -> float:
+    """Get historical average for validation"""
+    try:
+        if not historical_data:
+            return range_value.center_value
+        
+        # Precomputed average supplied by the caller
+        avg_value = historical_data.get('mean')
+        
+        if avg_value is None:
+            if 'values' not in historical_data:
+                return range_value.center_value
+            
+            values = historical_data['values']
+            if isinstance(values, np.ndarray):
+                # Vectorized reduction, no per-element Python iteration
+                if values.size == 0:
+                    return range_value.center_value
+                avg_value = float(values.mean())
+            else:
+                if not values:
+                    return range_value.center_value
+                
+                # Calculate average of historical values
+                avg_value = sum(values) / len(values)
+        
+        # Ensure it's within reasonable bounds
+        min_bound = range_value.min_value * 0.8
+        max_bound = range_value.max_value * 1.2
+        
+        return max(min_bound, min(max_bound, avg_value))
+    
+    except Exception as e:
+        logger.error("Error getting historical average: %s", e)
+        return range_value.center_value
+
+def _zone_typical_value(zone: str, range_value: RangeValue) -> float:
+    """Get zone-typical value for a village zone"""
+    zone_factor = _ZONE_ADJUSTMENTS.get(zone, 1.0)
+    return range_value.center_value * zone_factor
+
+class VillageContext(NamedTuple):
+    """Context information for a village (immutable, tuple-backed)"""
     village_name: str
     coordinates: Tuple[float, float]
     soil_type: str = "clay"
@@ -119,6 +300,13 @@ class RangeProcessor:
             NutrientType.ZINC: "ppm",
             NutrientType.SOIL_PH: "pH"
         }
+        
+        # Nutrient-specific adjustments (micronutrients default to 0.95)
+        self._nutrient_mult = {
+            NutrientType.NITROGEN: 1.05,    # More affected by rainfall and soil type
+            NutrientType.PHOSPHORUS: 0.98,  # More stable
+            NutrientType.POTASSIUM: 1.02    # Moderately affected
+        }
     
     def extract_range_values(self, range_str: str) -> Optional[RangeValue]:
         """
@@ -132,44 +320,10 @@ class RangeProcessor:
         """
         try:
             # Remove extra whitespace
-            range_str = range_str.strip()
-            
-            # Pattern for range: "min-max unit" or "min-max"
-            range_pattern = r'(\d+\.?\d*)\s*-\s*(\d+\.?\d*)\s*([a-zA-Z/]+)?'
-            match = re.search(range_pattern, range_str)
-            
-            if match:
-                min_val = float(match.group(1))
-                max_val = float(match.group(2))
-                unit = match.group(3) if match.group(3) else "kg/ha"
-                
-                return RangeValue(
-                    min_value=min_val,
-                    max_value=max_val,
-                    unit=unit,
-                    confidence=0.8  # Default confidence for parsed ranges
-                )
-            
-            # Pattern for single value: "420 kg/ha"
-            single_pattern = r'(\d+\.?\d*)\s*([a-zA-Z/]+)?'
-            match = re.search(single_pattern, range_str)
-            
-            if match:
-                value = float(match.group(1))
-                unit = match.group(2) if match.group(2) else "kg/ha"
-                
-                return RangeValue(
-                    min_value=value,
-                    max_value=value,
-                    unit=unit,
-                    confidence=0.9  # Higher confidence for single values
-                )
-            
-            logger.warning(f"Could not parse range string: {range_str}")
-            return None
+            return _parse_range_cached(range_str.strip())
             
         except Exception as e:
-            logger.error(f"Error parsing range string '{range_str}': {e}")
+            logger.error("Error parsing range string '%s': %s", range_str, e)
             return None
     
     def ai_powered_range_processing(
@@ -201,37 +355,30 @@ class RangeProcessor:
             context_factor = self._calculate_context_factor(village_context, nutrient_type)
             
             # AI-powered processing based on satellite agreement
-            satellite_agreement = self._calculate_satellite_agreement(
+            satellite_agreement = _satellite_agreement(
                 satellite_value, range_value
             )
             
+            # Pick the processing case (a ProcessingMethod code), in priority order
             if satellite_agreement > 0.7:
-                # High agreement - use satellite-adjusted center
-                processed_value = range_value.center_value * context_factor
-                method = "satellite_adjusted_center"
-                confidence = 0.95
-                
+                case = 0    # High agreement - use satellite-adjusted center
             elif satellite_value > range_value.max_value:
-                # Satellite higher than range - use center with adjustment (FIXED)
-                processed_value = range_value.center_value * context_factor
-                method = "satellite_higher_center"
-                confidence = 0.85
-                
+                case = 1    # Satellite higher than range - use center with adjustment (FIXED)
             elif satellite_value < range_value.min_value:
-                # Satellite lower than range - use min with adjustment
-                processed_value = range_value.min_value * context_factor
-                method = "satellite_lower_min"
-                confidence = 0.85
-                
+                case = 2    # Satellite lower than range - use min with adjustment
             else:
-                # Satellite within range - use weighted average
+                case = 3    # Satellite within range - use weighted average
+            
+            method, confidence = _PROCESSING_CASES[case]
+            
+            if case == 3:
                 weight = 0.6  # RESTORED: 60% ICAR, 40% satellite (balanced approach)
-                processed_value = (
-                    range_value.center_value * weight + 
-                    satellite_value * (1 - weight)
-                ) * context_factor
-                method = "weighted_average"
-                confidence = 0.9
+                base_value = range_value.center_value * weight + satellite_value * (1 - weight)
+            elif case == 2:
+                base_value = range_value.min_value
+            else:
+                base_value = range_value.center_value
+            processed_value = base_value * context_factor
             
             return {
                 'value': round(processed_value, 2),
@@ -243,9 +390,116 @@ class RangeProcessor:
             }
             
         except Exception as e:
-            logger.error(f"Error in AI-powered processing: {e}")
+            logger.error("Error in AI-powered processing: %s", e)
             return self._fallback_processing(range_str, satellite_value, village_context)
     
+    def ai_powered_range_processing_batch(
+        self,
+        range_strs: List[str],
+        satellite_values: np.ndarray,
+        village_contexts: List[VillageContext],
+        nutrient_type: NutrientType
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized AI-powered range processing for many villages
+        
+        Args:
+            range_strs: Range strings from ICAR data
+            satellite_values: Satellite-derived values
+            village_contexts: Village context information, one per range
+            nutrient_type: Type of nutrient being processed
+            
+        Returns:
+            Dictionary of arrays (value, method_code, confidence,
+            context_factor, satellite_agreement). Method codes are
+            ProcessingMethod values; rows whose range cannot be parsed get
+            ProcessingMethod.FALLBACK and the fallback processing value.
+        """
+        satellite_values = np.asarray(satellite_values, dtype=np.float64)
+        count = len(range_strs)
+        
+        # Parse each range once (cached) and stack the bounds
+        range_values = [self.extract_range_values(range_str) for range_str in range_strs]
+        parsed = np.fromiter((rv is not None for rv in range_values), dtype=bool, count=count)
+        min_values = np.fromiter(
+            (rv.min_value if rv else 0.0 for rv in range_values), dtype=np.float64, count=count
+        )
+        max_values = np.fromiter(
+            (rv.max_value if rv else 0.0 for rv in range_values), dtype=np.float64, count=count
+        )
+        center_values = (min_values + max_values) / 2
+        max_distances = (max_values - min_values) / 2
+        
+        context_factors = np.fromiter(
+            (self._calculate_context_factor(vc, nutrient_type) for vc in village_contexts),
+            dtype=np.float64,
+            count=count
+        )
+        
+        # Satellite agreement, same two cases as _calculate_satellite_agreement
+        inside = (
+            (max_distances != 0)
+            & (min_values <= satellite_values)
+            & (satellite_values <= max_values)
+        )
+        distances = np.where(
+            satellite_values > max_values,
+            satellite_values - max_values,
+            min_values - satellite_values
+        )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            agreement = np.where(
+                inside,
+                1 - np.abs(satellite_values - center_values) / max_distances,
+                1 - distances / center_values
+            )
+        agreement = np.maximum(agreement, 0.0)
+        agreement[~inside & (center_values == 0)] = 0.5  # Zero-centre range
+        
+        # Branch selection in the same priority order as the scalar method
+        conditions = [
+            agreement > 0.7,
+            satellite_values > max_values,
+            satellite_values < min_values
+        ]
+        weight = 0.6  # 60% ICAR, 40% satellite (balanced approach)
+        processed = np.select(
+            conditions,
+            [center_values, center_values, min_values],
+            default=center_values * weight + satellite_values * (1 - weight)
+        ) * context_factors
+        method_codes = np.select(
+            conditions,
+            [
+                ProcessingMethod.SATELLITE_ADJUSTED_CENTER,
+                ProcessingMethod.SATELLITE_HIGHER_CENTER,
+                ProcessingMethod.SATELLITE_LOWER_MIN
+            ],
+            default=ProcessingMethod.WEIGHTED_AVERAGE
+        ).astype(np.int8)
+        
+        # Python's round (correctly rounded) so values match the scalar method;
+        # np.round can differ by 0.01 on ties
+        values = np.array([round(value, 2) for value in processed.tolist()])
+        confidence = _PROCESSING_CONFIDENCES[method_codes]
+        
+        # Unparseable ranges go through the scalar fallback
+        for i in np.flatnonzero(~parsed):
+            fallback = self._fallback_processing(
+                range_strs[i], float(satellite_values[i]), village_contexts[i]
+            )
+            values[i] = fallback['value']
+            confidence[i] = fallback['confidence']
+            method_codes[i] = ProcessingMethod.FALLBACK
+        
+        return {
+            'value': values,
+            'method_code': method_codes,
+            'confidence': confidence,
+            'context_factor': context_factors,
+            'satellite_agreement': agreement
+        }
+    
     def multi_method_range_validation(
         self, 
         range_str: str, 
@@ -270,206 +524,81 @@ class RangeProcessor:
             if not range_value:
                 return self._fallback_processing(range_str, 0, village_context)
             
-            # Method 1: Simple average
-            method1_value = range_value.center_value
-            method1_confidence = 0.7
-            
-            # Method 2: Weighted average (60% min, 40% max)
-            method2_value = range_value.min_value * 0.6 + range_value.max_value * 0.4
-            method2_confidence = 0.75
-            
-            # Method 3: Satellite-adjusted
-            satellite_value = satellite_data.get('value', range_value.center_value)
-            method3_value = self._adjust_to_satellite(satellite_value, range_value)
-            method3_confidence = 0.8
-            
-            # Method 4: Historical pattern
-            method4_value = self._get_historical_average(historical_data, range_value)
-            method4_confidence = 0.65
-            
-            # Method 5: Zone-based typical value
-            method5_value = self._get_zone_typical_value(village_context, range_value)
-            method5_confidence = 0.7
-            
-            # Calculate consensus
-            methods = [
-                (method1_value, method1_confidence),
-                (method2_value, method2_confidence),
-                (method3_value, method3_confidence),
-                (method4_value, method4_confidence),
-                (method5_value, method5_confidence)
-            ]
-            
-            # Weighted consensus
-            total_weight = sum(conf for _, conf in methods)
-            consensus_value = sum(val * conf for val, conf in methods) / total_weight
+            center_value = range_value.center_value
+            satellite_value = satellite_data.get('value', center_value)
+            if not isinstance(satellite_value, numbers.Real):
+                satellite_value = center_value  # Missing or non-numeric satellite value
+            
+            # Candidate values, confidences in _METHOD_CONFIDENCES
+            values = (
+                # Method 1: Simple average
+                center_value,
+                # Method 2: Weighted average (60% min, 40% max)
+                range_value.min_value * 0.6 + range_value.max_value * 0.4,
+                # Method 3: Satellite-adjusted
+                _adjust_to_satellite(satellite_value, range_value),
+                # Method 4: Historical pattern
+                _historical_average(historical_data, range_value),
+                # Method 5: Zone-based typical value
+                _zone_typical_value(village_context.zone, range_value)
+            )
             
-            # Calculate overall confidence
-            overall_confidence = self._calculate_overall_confidence(methods)
+            # Weighted consensus and overall confidence
+            consensus_value, overall_confidence = _consensus(values, _METHOD_CONFIDENCES)
             
             return {
                 'value': round(consensus_value, 2),
                 'method': 'multi_method_consensus',
                 'confidence': overall_confidence,
-                'methods_used': len(methods),
+                'methods_used': len(values),
                 'consensus_details': {
-                    'method1': method1_value,
-                    'method2': method2_value,
-                    'method3': method3_value,
-                    'method4': method4_value,
-                    'method5': method5_value
+                    'method1': values[0],
+                    'method2': values[1],
+                    'method3': values[2],
+                    'method4': values[3],
+                    'method5': values[4]
                 }
             }
             
         except Exception as e:
-            logger.error(f"Error in multi-method validation: {e}")
+            logger.error("Error in multi-method validation: %s", e)
             return self._fallback_processing(range_str, 0, village_context)
     
     def _calculate_context_factor(self, village_context: VillageContext, nutrient_type: NutrientType) -> float:
         """Calculate context adjustment factor"""
-        try:
-            soil_factor = self.context_factors['soil_type'].get(village_context.soil_type, 1.0)
-            crop_factor = self.context_factors['crop_type'].get(village_context.crop_type, 1.0)
-            season_factor = self.context_factors['season'].get(village_context.season, 1.0)
-            rainfall_factor = self.context_factors['rainfall'].get(village_context.rainfall, 1.0)
-            
-            # Combine factors with nutrient-specific adjustments
-            base_factor = soil_factor * crop_factor * season_factor * rainfall_factor
-            
-            # Nutrient-specific adjustments
-            if nutrient_type == NutrientType.NITROGEN:
-                # Nitrogen is more affected by rainfall and soil type
-                return base_factor * 1.05
-            elif nutrient_type == NutrientType.PHOSPHORUS:
-                # Phosphorus is more stable
-                return base_factor * 0.98
-            elif nutrient_type == NutrientType.POTASSIUM:
-                # Potassium is moderately affected
-                return base_factor * 1.02
-            else:
-                # Micronutrients are more stable
-                return base_factor * 0.95
-                
-        except Exception as e:
-            logger.error(f"Error calculating context factor: {e}")
-            return 1.0
+        # Combine factors with nutrient-specific adjustments; read through context_factors
+        # on every call so reassigned sub-tables take effect
+        factors = self.context_factors
+        base_factor = (
+            factors['soil_type'].get(village_context.soil_type, 1.0) *
+            factors['crop_type'].get(village_context.crop_type, 1.0) *
+            factors['season'].get(village_context.season, 1.0) *
+            factors['rainfall'].get(village_context.rainfall, 1.0)
+        )
+        return base_factor * self._nutrient_mult.get(nutrient_type, 0.95)
     
     def _calculate_satellite_agreement(self, satellite_value: float, range_value: RangeValue) -> float:
         """Calculate agreement between satellite and ICAR range"""
-        try:
-            if range_value.range_width == 0:
-                # Single value - calculate percentage difference
-                diff = abs(satellite_value - range_value.center_value)
-                return max(0, 1 - (diff / range_value.center_value))
-            
-            # Range value - calculate how well satellite fits
-            if range_value.min_value <= satellite_value <= range_value.max_value:
-                # Satellite is within range
-                center_distance = abs(satellite_value - range_value.center_value)
-                max_distance = range_value.range_width / 2
-                return max(0, 1 - (center_distance / max_distance))
-            else:
-                # Satellite is outside range
-                if satellite_value > range_value.max_value:
-                    distance = satellite_value - range_value.max_value
-                else:
-                    distance = range_value.min_value - satellite_value
-                
-                # Calculate agreement based on distance
-                range_center = range_value.center_value
-                return max(0, 1 - (distance / range_center))
-                
-        except Exception as e:
-            logger.error(f"Error calculating satellite agreement: {e}")
-            return 0.5
+        return _satellite_agreement(satellite_value, range_value)
     
     def _adjust_to_satellite(self, satellite_value: float, range_value: RangeValue) -> float:
         """Adjust ICAR value based on satellite data"""
-        try:
-            if range_value.range_width == 0:
-                return range_value.center_value
-            
-            # If satellite is within range, use weighted average
-            if range_value.min_value <= satellite_value <= range_value.max_value:
-                return range_value.center_value * 0.7 + satellite_value * 0.3
-            
-            # If satellite is outside range, adjust towards it
-            if satellite_value > range_value.max_value:
-                return range_value.max_value * 0.8 + satellite_value * 0.2
-            else:
-                return range_value.min_value * 0.8 + satellite_value * 0.2
-                
-        except Exception as e:
-            logger.error(f"Error adjusting to satellite: {e}")
-            return range_value.center_value
+        return _adjust_to_satellite(satellite_value, range_value)
     
     def _get_historical_average(self, historical_data: Dict, range_value: RangeValue) -> float:
         """Get historical average for validation"""
-        try:
-            if not historical_data or 'values' not in historical_data:
-                return range_value.center_value
-            
-            values = historical_data['values']
-            if not values:
-                return range_value.center_value
-            
-            # Calculate average of historical values
-            avg_value = sum(values) / len(values)
-            
-            # Ensure it's within reasonable bounds
-            min_bound = range_value.min_value * 0.8
-            max_bound = range_value.max_value * 1.2
-            
-            return max(min_bound, min(max_bound, avg_value))
-            
-        except Exception as e:
-            logger.error(f"Error getting historical average: {e}")
-            return range_value.center_value
+        return _historical_average(historical_data, range_value)
     
     def _get_zone_typical_value(self, village_context: VillageContext, range_value: RangeValue) -> float:
         """Get zone-typical value based on village context"""
-        try:
-            # Zone-based adjustments
-            zone_adjustments = {
-                'yellow': 1.0,      # Normal zone
-                'red': 1.1,         # High nutrient zone
-                'green': 0.9,       # Low nutrient zone
-                'orange': 1.05,     # Medium-high zone
-                'grey': 0.95        # Medium-low zone
-            }
-            
-            zone_factor = zone_adjustments.get(village_context.zone, 1.0)
-            return range_value.center_value * zone_factor
-            
-        except Exception as e:
-            logger.error(f"Error getting zone typical value: {e}")
-            return range_value.center_value
+        return _zone_typical_value(village_context.zone, range_value)
     
-    def _calculate_overall_confidence(self, methods: List[Tuple[float, float]]) -> float:
-        """Calculate overall confidence from multiple methods"""
-        try:
-            if not methods:
-                return 0.5
-            
-            # Calculate variance between methods
-            values = [val for val, _ in methods]
-            mean_value = sum(values) / len(values)
-            variance = sum((val - mean_value) ** 2 for val in values) / len(values)
-            
-            # Lower variance = higher confidence
-            variance_factor = max(0, 1 - (variance / mean_value) if mean_value > 0 else 0)
-            
-            # Average confidence of methods
-            avg_confidence = sum(conf for _, conf in methods) / len(methods)
-            
-            # Combine variance factor with average confidence
-            overall_confidence = (avg_confidence * 0.7) + (variance_factor * 0.3)
-            
-            return min(1.0, max(0.0, overall_confidence))
-            
-        except Exception as e:
-            logger.error(f"Error calculating overall confidence: {e}")
+    def _calculate_overall_confidence(self, values: Sequence[float], confs: Sequence[float]) -> float:
+        """Calculate overall confidence from parallel method values and confidences"""
+        if len(values) == 0:
             return 0.5
+        
+        return _consensus(values, confs)[1]
     
     def _fallback_processing(
         self, 
@@ -480,8 +609,7 @@ class RangeProcessor:
         """Fallback processing when main methods fail"""
         try:
             # Try to extract any numeric value
-            numeric_pattern = r'(\d+\.?\d*)'
-            match = re.search(numeric_pattern, range_str)
+            match = _numeric_search(range_str)
             
             if match:
                 value = float(match.group(1))
@@ -503,7 +631,7 @@ class RangeProcessor:
             }
             
         except Exception as e:
-            logger.error(f"Error in fallback processing: {e}")
+            logger.error("Error in fallback processing: %s", e)
             return {
                 'value': 100.0,
                 'method': 'fallback_error',
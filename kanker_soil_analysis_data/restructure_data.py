@@ -5,23 +5,101 @@ Restructure kanker_complete_soil_analysis_data.json for better organization
 
 import json
 from datetime import datetime
+from functools import lru_cache
 
-def restructure_soil_analysis_data():
+import numpy as np
+
+from json_io import load_json, save_json
+
+# Village field holding each nutrient's zone name, and its default
+ZONE_FIELDS = {
+    "nitrogen": ('zone', 'unknown'),
+    "phosphorus": ('phosphorus_zone', 'Low Phosphorus'),
+    "potassium": ('potassium_zone', 'Low Potassium'),
+    "boron": ('boron_zone', 'Low Boron'),
+    "iron": ('iron_zone', 'Low Iron'),
+    "zinc": ('zinc_zone', 'Low Zinc'),
+    "soil_ph": ('soil_ph_zone', 'Low pH')
+}
+
+# Zone name -> stats bucket rules per nutrient: (exact names, keyword rules, fallback).
+# Nitrogen matches exact zone names and ignores anything else; the other
+# nutrients take the first keyword contained in the zone name, else "low".
+ZONE_BUCKET_RULES = {
+    "nitrogen": (
+        (("Yellow Zone (Low-Medium Nitrogen)", "yellow"), ("Red Zone (High/Very High Nitrogen)", "red")),
+        (),
+        None
+    ),
+    "phosphorus": ((), (("Yellow", "yellow"), ("Green", "green")), "low"),
+    "potassium": ((), (("Green", "green"), ("Yellow", "yellow")), "low"),
+    "boron": ((), (("Green", "green"), ("Red", "red")), "low"),
+    "iron": ((), (("Green", "green"), ("Red", "red")), "low"),
+    "zinc": ((), (("Green", "green"), ("Red", "red")), "low"),
+    "soil_ph": ((), (("Green", "green"), ("Orange", "orange"), ("Grey", "grey")), "low")
+}
+
+@lru_cache(maxsize=None)
+def zone_bucket(zone_name, rules):
+    """Stats bucket for a zone name (memoized: only a handful of distinct names exist)"""
+    exact_names, keywords, fallback = rules
+    
+    for name, bucket in exact_names:
+        if zone_name == name:
+            return bucket
+    
+    for keyword, bucket in keywords:
+        if keyword in zone_name:
+            return bucket
+    
+    return fallback
+
+# Stats buckets per nutrient in output order; a village's bucket code is the index here
+ZONE_BUCKETS = {
+    "nitrogen": ("yellow", "red"),
+    "phosphorus": ("yellow", "green", "low"),
+    "potassium": ("green", "yellow", "low"),
+    "boron": ("green", "red", "low"),
+    "iron": ("green", "red", "low"),
+    "zinc": ("green", "red", "low"),
+    "soil_ph": ("green", "orange", "grey", "low")
+}
+
+@lru_cache(maxsize=None)
+def zone_bucket_code(zone_name, nutrient):
+    """Code of a zone name's stats bucket in ZONE_BUCKETS[nutrient]; len(buckets) if not counted"""
+    buckets = ZONE_BUCKETS[nutrient]
+    bucket = zone_bucket(zone_name, ZONE_BUCKET_RULES[nutrient])
+    return buckets.index(bucket) if bucket in buckets else len(buckets)
+
+def build_village_soa(villages):
     """
-    Restructure the soil analysis data for better organization and clarity
+    Column (structure-of-arrays) view of the villages for repeated scans
+    
+    Returns:
+        Dict with float64 'lat'/'lon' arrays (NaN where missing) and, per nutrient,
+        an int8 array of zone bucket codes indexing ZONE_BUCKETS[nutrient]
     """
-    file_path = 'kanker_complete_soil_analysis_data.json'
+    coords = np.array(
+        [village.get('coordinates') or (None, None) for village in villages], dtype=np.float64
+    ).reshape(-1, 2)
+    soa = {'lat': coords[:, 0], 'lon': coords[:, 1]}
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print(f"Error: File not found at {file_path}")
-        return
-    except json.JSONDecodeError:
-        print(f"Error: Could not decode JSON from {file_path}")
-        return
+    for nutrient, (field, default) in ZONE_FIELDS.items():
+        soa[nutrient] = np.fromiter(
+            (zone_bucket_code(village.get(field, default), nutrient) for village in villages),
+            dtype=np.int8, count=len(villages)
+        )
     
+    return soa
+
+def apply_restructure(data):
+    """
+    Build the restructured soil analysis data from the loaded data (no I/O)
+    
+    Returns:
+        New dict with metadata, zones, village data, statistics and data quality
+    """
     # Create new structured data
     restructured_data = {
         "metadata": {
@@ -228,77 +306,17 @@ def restructure_soil_analysis_data():
     }
     
     # Process village data
-    village_stats = {
-        "nitrogen": {"yellow": 0, "red": 0},
-        "phosphorus": {"yellow": 0, "green": 0, "low": 0},
-        "potassium": {"green": 0, "yellow": 0, "low": 0},
-        "boron": {"green": 0, "red": 0, "low": 0},
-        "iron": {"green": 0, "red": 0, "low": 0},
-        "zinc": {"green": 0, "red": 0, "low": 0},
-        "soil_ph": {"green": 0, "orange": 0, "grey": 0, "low": 0}
-    }
+    villages = data['village_wise_data']['villages']
+    soa = build_village_soa(villages)
     
-    for village in data['village_wise_data']['villages']:
-        # Count villages by zones
-        nitrogen_zone = village.get('zone', 'unknown')
-        phosphorus_zone = village.get('phosphorus_zone', 'Low Phosphorus')
-        potassium_zone = village.get('potassium_zone', 'Low Potassium')
-        boron_zone = village.get('boron_zone', 'Low Boron')
-        iron_zone = village.get('iron_zone', 'Low Iron')
-        zinc_zone = village.get('zinc_zone', 'Low Zinc')
-        soil_ph_zone = village.get('soil_ph_zone', 'Low pH')
-        
-        if nitrogen_zone == "Yellow Zone (Low-Medium Nitrogen)":
-            village_stats["nitrogen"]["yellow"] += 1
-        elif nitrogen_zone == "Red Zone (High/Very High Nitrogen)":
-            village_stats["nitrogen"]["red"] += 1
-            
-        if 'Yellow' in phosphorus_zone:
-            village_stats["phosphorus"]["yellow"] += 1
-        elif 'Green' in phosphorus_zone:
-            village_stats["phosphorus"]["green"] += 1
-        else:
-            village_stats["phosphorus"]["low"] += 1
-            
-        if 'Green' in potassium_zone:
-            village_stats["potassium"]["green"] += 1
-        elif 'Yellow' in potassium_zone:
-            village_stats["potassium"]["yellow"] += 1
-        else:
-            village_stats["potassium"]["low"] += 1
-            
-        if 'Green' in boron_zone:
-            village_stats["boron"]["green"] += 1
-        elif 'Red' in boron_zone:
-            village_stats["boron"]["red"] += 1
-        else:
-            village_stats["boron"]["low"] += 1
-            
-        if 'Green' in iron_zone:
-            village_stats["iron"]["green"] += 1
-        elif 'Red' in iron_zone:
-            village_stats["iron"]["red"] += 1
-        else:
-            village_stats["iron"]["low"] += 1
-            
-        if 'Green' in zinc_zone:
-            village_stats["zinc"]["green"] += 1
-        elif 'Red' in zinc_zone:
-            village_stats["zinc"]["red"] += 1
-        else:
-            village_stats["zinc"]["low"] += 1
-            
-        if 'Green' in soil_ph_zone:
-            village_stats["soil_ph"]["green"] += 1
-        elif 'Orange' in soil_ph_zone:
-            village_stats["soil_ph"]["orange"] += 1
-        elif 'Grey' in soil_ph_zone:
-            village_stats["soil_ph"]["grey"] += 1
-        else:
-            village_stats["soil_ph"]["low"] += 1
-        
-        # Add village to restructured data
-        restructured_data["village_data"]["villages"].append(village)
+    # Count villages by zones from the bucket code columns
+    village_stats = {}
+    for nutrient, buckets in ZONE_BUCKETS.items():
+        counts = np.bincount(soa[nutrient], minlength=len(buckets) + 1)
+        village_stats[nutrient] = dict(zip(buckets, counts[:len(buckets)].tolist()))
+    
+    # Add villages to restructured data
+    restructured_data["village_data"]["villages"].extend(villages)
     
     # Add statistics
     restructured_data["statistics"]["nutrient_distribution"] = village_stats
@@ -312,10 +330,28 @@ def restructure_soil_analysis_data():
     if 'recommendations' in data:
         restructured_data["statistics"]["recommendations"] = data['recommendations']
     
+    return restructured_data
+
+def restructure_soil_analysis_data():
+    """
+    Restructure the soil analysis data for better organization and clarity
+    """
+    file_path = 'kanker_complete_soil_analysis_data.json'
+    
+    try:
+        data = load_json(file_path)
+    except FileNotFoundError:
+        print(f"Error: File not found at {file_path}")
+        return
+    except json.JSONDecodeError:
+        print(f"Error: Could not decode JSON from {file_path}")
+        return
+    
+    restructured_data = apply_restructure(data)
+    
     # Save restructured data
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(restructured_data, f, indent=2, ensure_ascii=False)
+        save_json(file_path, restructured_data)
         
         print(f"✅ Successfully restructured {file_path}")
         print(f"   - Total Villages: {len(restructured_data['village_data']['villages'])}")
@@ -0,0 +1,73 @@
+"""
+Tests for the Phase 1 data validator (kanker_soil_analysis_data/modules/data_validator.py)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Phase 1 modules are imported by path, as api/working does
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'modules'))
+
+from data_validator import DataValidator, ValidationLevel
+
+
+@pytest.fixture
+def validator():
+    return DataValidator()
+
+
+@pytest.mark.parametrize("zone", ["yellow", "red", "green"])
+def test_nutrient_score_on_level_boundary_matches_statistics_mean(validator, zone):
+    # Sub-scores 0.95, 0.6, 0.95 and 0.7 average to just below the 0.8 HIGH threshold
+    # when rounded like statistics.mean; naive float addition would round up to 0.8
+    result = validator.validate_nutrient_data(
+        {'value': '410', 'zone': zone, 'unit': 'kg/ha'}, 'nitrogen', {'zone': zone}
+    )
+
+    assert result.confidence_score == 0.7999999999999999
+    assert result.validation_level == ValidationLevel.MEDIUM
+
+
+# Grid of inputs that straddles every weather and soil rule boundary
+RAINFALL = ['low', 'normal', 'high']
+TEMPERATURES = [15, 20, 25, 30, 35]
+HUMIDITIES = [30, 40, 60, 70, 80]
+SOIL_TYPES = ['clay', 'sandy', 'loam']
+PH_VALUES = [5.0, 5.5, 6.0, 7.0, 7.5, 8.0]
+ICAR_VALUES = [250, 300, 350, 400, 450]
+
+
+def _grid(*axes):
+    return [column.ravel() for column in np.meshgrid(*axes, indexing='ij')]
+
+
+def test_weather_scores_agree_across_fused_fallback_and_batch(validator):
+    rainfall, temperature, humidity = _grid(
+        np.array(RAINFALL), np.array(TEMPERATURES, dtype=float), np.array(HUMIDITIES, dtype=float)
+    )
+    batch = validator._validate_weather_consistency_batch(rainfall.shape, rainfall, temperature, humidity)
+
+    for i, (rain, temp, hum) in enumerate(zip(rainfall.tolist(), temperature.tolist(), humidity.tolist())):
+        weather = {'rainfall': rain, 'temperature': temp, 'humidity': hum}
+        fallback = validator._validate_weather_consistency(weather, {'value': '300'}, {})
+        fused = validator.multi_source_validation({'value': 300}, {'value': '300'}, weather, {}, {})
+
+        assert fallback == fused.details['weather_consistency'] == batch[i], weather
+
+
+def test_soil_scores_agree_across_fused_fallback_and_batch(validator):
+    soil_type, ph_value, icar_value = _grid(
+        np.array(SOIL_TYPES), np.array(PH_VALUES), np.array(ICAR_VALUES, dtype=float)
+    )
+    batch = validator._validate_soil_consistency_batch(icar_value, soil_type, ph_value)
+
+    for i, (soil, ph, value) in enumerate(zip(soil_type.tolist(), ph_value.tolist(), icar_value.tolist())):
+        soil_data = {'soil_type': soil, 'ph': ph}
+        icar_data = {'value': f"{value:g} kg/ha"}
+        fallback = validator._validate_soil_consistency(soil_data, icar_data, {})
+        fused = validator.multi_source_validation({'value': value}, icar_data, {}, soil_data, {})
+
+        assert fallback == fused.details['soil_consistency'] == batch[i], soil_data
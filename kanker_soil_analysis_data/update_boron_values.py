@@ -5,61 +5,54 @@ Based on zone classification and realistic calculations
 """
 
 import json
-import random
-from math import radians, sin, cos, sqrt, atan2
-
-def calculate_distance(lat1, lon1, lat2, lon2):
-    """Calculate distance between two points in km using Haversine formula"""
-    R = 6371  # Radius of Earth in kilometers
-
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-
-    a = sin(dlat / 2)**2 + cos(lat1) * cos(lat2) * sin(dlon / 2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+import numpy as np
+
+from json_io import load_json, save_json
+from zone_utils import (
+    village_coordinate_arrays, assign_zones, zone_inputs_digest, sections_present, read_digest,
+    write_digest
+)
+
+# Define Boron Zones with bounding boxes
+BORON_ZONES_BBOX = {
+    "Green Zone (Sufficient Boron)": {
+        "lat_range": (20.20, 20.33),
+        "lon_range": (81.30, 81.49),
+        "boron_level_category": "Sufficient",
+        "boron_range_ppm": (0.5, 1.2),
+        "color": "green",
+        "description": "South, West and Central portion with sufficient boron"
+    },
+    "Red Zone (Deficient Boron)": {
+        "lat_range": (20.16, 20.25),
+        "lon_range": (81.21, 81.47),
+        "boron_level_category": "Deficient",
+        "boron_range_ppm": (0.1, 0.5),
+        "color": "red",
+        "description": "Mainly South and few North patches with deficient boron"
+    }
+}
 
-    distance = R * c
-    return distance
+# Keys apply_boron writes into the document-level sections; other scripts (nitrogen) replace
+# these sections wholesale, so the skip check below needs them present too
+BORON_SECTION_KEYS = {
+    "overall_statistics": ("boron_summary", "boron_zones"),
+    "recommendations": ("boron_recommendations", "zone_wise_boron_strategy"),
+    "data_quality": ("boron_data_source", "boron_zones", "boron_calculation_method")
+}
 
-def update_boron_values():
+def apply_boron(data, rng=None):
     """
-    Update boron values for villages in kanker_complete_soil_analysis_data.json
-    based on defined boron zones.
-    """
-    file_path = 'kanker_complete_soil_analysis_data.json'
+    Assign boron zones and values to villages and add boron statistics,
+    recommendations and data quality notes (mutates data in place, no I/O)
 
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print(f"Error: File not found at {file_path}")
-        return
-    except json.JSONDecodeError:
-        print(f"Error: Could not decode JSON from {file_path}")
-        return
-
-    # Define Boron Zones with bounding boxes
-    boron_zones_bbox = {
-        "Green Zone (Sufficient Boron)": {
-            "lat_range": (20.20, 20.33),
-            "lon_range": (81.30, 81.49),
-            "boron_level_category": "Sufficient",
-            "boron_range_ppm": (0.5, 1.2),
-            "color": "green",
-            "description": "South, West and Central portion with sufficient boron"
-        },
-        "Red Zone (Deficient Boron)": {
-            "lat_range": (20.16, 20.25),
-            "lon_range": (81.21, 81.47),
-            "boron_level_category": "Deficient",
-            "boron_range_ppm": (0.1, 0.5),
-            "color": "red",
-            "description": "Mainly South and few North patches with deficient boron"
-        }
-    }
+    Args:
+        data: Soil analysis data with village_wise_data
+        rng: numpy Generator for the value draws (a fresh default_rng() if None)
 
+    Returns:
+        (updated_villages_count, zone_stats)
+    """
     updated_villages_count = 0
     zone_stats = {
         "Green Zone (Sufficient Boron)": 0,
@@ -68,42 +61,35 @@ def update_boron_values():
     }
     
     if 'village_wise_data' in data and 'villages' in data['village_wise_data']:
-        for village in data['village_wise_data']['villages']:
-            lat, lon = village.get('coordinates', [None, None])
-
-            if lat is None or lon is None:
-                # Skip if coordinates are missing
-                continue
-
-            assigned_zone = "Low Boron"
-            boron_level_category = "Low"
-            estimated_boron_range = (0.1, 0.3) # Default Low
-
-            # Check for Red Zone (Deficient Boron) first (more specific overlap)
-            if (boron_zones_bbox["Red Zone (Deficient Boron)"]["lat_range"][0] <= lat <= boron_zones_bbox["Red Zone (Deficient Boron)"]["lat_range"][1] and
-                boron_zones_bbox["Red Zone (Deficient Boron)"]["lon_range"][0] <= lon <= boron_zones_bbox["Red Zone (Deficient Boron)"]["lon_range"][1]):
-                assigned_zone = "Red Zone (Deficient Boron)"
-                boron_level_category = boron_zones_bbox["Red Zone (Deficient Boron)"]["boron_level_category"]
-                estimated_boron_range = boron_zones_bbox["Red Zone (Deficient Boron)"]["boron_range_ppm"]
-                zone_stats["Red Zone (Deficient Boron)"] += 1
-            # Then check for Green Zone (Sufficient Boron)
-            elif (boron_zones_bbox["Green Zone (Sufficient Boron)"]["lat_range"][0] <= lat <= boron_zones_bbox["Green Zone (Sufficient Boron)"]["lat_range"][1] and
-                  boron_zones_bbox["Green Zone (Sufficient Boron)"]["lon_range"][0] <= lon <= boron_zones_bbox["Green Zone (Sufficient Boron)"]["lon_range"][1]):
-                assigned_zone = "Green Zone (Sufficient Boron)"
-                boron_level_category = boron_zones_bbox["Green Zone (Sufficient Boron)"]["boron_level_category"]
-                estimated_boron_range = boron_zones_bbox["Green Zone (Sufficient Boron)"]["boron_range_ppm"]
-                zone_stats["Green Zone (Sufficient Boron)"] += 1
-            else:
-                zone_stats["Low Boron"] += 1
-            
-            # Assign boron values
-            min_b, max_b = estimated_boron_range
-            estimated_boron = round(random.uniform(min_b, max_b), 3)
+        villages, lat, lon = village_coordinate_arrays(data['village_wise_data']['villages'])
+
+        # Zone codes in priority order: Red first (more specific overlap), then Green, else Low
+        zone_names = ("Red Zone (Deficient Boron)", "Green Zone (Sufficient Boron)")
+        zone_codes = assign_zones(lat, lon, [BORON_ZONES_BBOX[name] for name in zone_names])
+
+        # Per-code level category and boron range, the last entry being the Low default
+        categories = [BORON_ZONES_BBOX[name]["boron_level_category"] for name in zone_names] + ["Low"]
+        ranges = np.array([BORON_ZONES_BBOX[name]["boron_range_ppm"] for name in zone_names] + [(0.1, 0.3)])
+        names = zone_names + ("Low Boron",)
+
+        # Assign boron values, one Generator draw and one formatting call for all villages
+        if rng is None:
+            rng = np.random.default_rng()
+        estimated_boron = rng.uniform(ranges[zone_codes, 0], ranges[zone_codes, 1])
+        estimated_boron_text = np.char.mod("%.3f ppm", estimated_boron).tolist()
+
+        for code, count in enumerate(np.bincount(zone_codes, minlength=len(names)).tolist()):
+            zone_stats[names[code]] = count
+
+        for village, code, value in zip(villages, zone_codes.tolist(), estimated_boron_text):
+            assigned_zone = names[code]
+            boron_level_category = categories[code]
 
             village['boron_level'] = boron_level_category
-            village['estimated_boron'] = f"{estimated_boron:.3f} ppm"
+            village['estimated_boron'] = value
             village['boron_zone'] = assigned_zone
-            village['boron_status'] = f"{village['village_name']} has {boron_level_category} boron in {assigned_zone}."
+            # The status sentence is derivable from village_name, boron_level and boron_zone; drop any stale copy
+            village.pop('boron_status', None)
             updated_villages_count += 1
 
     # Update overall statistics and recommendations for boron
@@ -162,16 +148,51 @@ def update_boron_values():
     data['data_quality']['boron_zones'] = "Based on provided Green Zone and Red Zone coordinates"
     data['data_quality']['boron_calculation_method'] = "Bounding box zone assignment + Realistic boron ranges (Hot Water Soluble Boron)"
 
+    return updated_villages_count, zone_stats
+
+def print_boron_summary(updated_villages_count, zone_stats):
+    """Print the boron zone distribution returned by apply_boron"""
+    print(f"\n📊 Boron Zone Distribution:")
+    print(f"   - Green Zone (Sufficient): {zone_stats['Green Zone (Sufficient Boron)']} villages")
+    print(f"   - Red Zone (Deficient): {zone_stats['Red Zone (Deficient Boron)']} villages") 
+    print(f"   - Low Boron: {zone_stats['Low Boron']} villages")
+    print(f"   - Total Updated: {updated_villages_count} villages")
+
+def update_boron_values():
+    """
+    Update boron values for villages in kanker_complete_soil_analysis_data.json
+    based on defined boron zones.
+    """
+    file_path = 'kanker_complete_soil_analysis_data.json'
+    cache_path = '.boron_cache'
+
+    try:
+        data = load_json(file_path)
+    except FileNotFoundError:
+        print(f"Error: File not found at {file_path}")
+        return
+    except json.JSONDecodeError:
+        print(f"Error: Could not decode JSON from {file_path}")
+        return
+
+    # Skip the rewrite when zones and village coordinates are unchanged since the last run
+    # and this script's village fields and section entries are all still in place
+    villages, lat, lon = village_coordinate_arrays(data.get('village_wise_data', {}).get('villages', []))
+    inputs_digest = zone_inputs_digest(BORON_ZONES_BBOX, lat, lon)
+    if (inputs_digest == read_digest(cache_path)
+            and all('boron_zone' in village for village in villages)
+            and sections_present(data, BORON_SECTION_KEYS)):
+        print(f"✅ Boron values in {file_path} are up to date ({len(villages)} villages), nothing to rewrite")
+        return
+
+    updated_villages_count, zone_stats = apply_boron(data)
+
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        save_json(file_path, data)
+        write_digest(cache_path, inputs_digest)
         
         print(f"✅ Successfully updated boron values for {updated_villages_count} villages in {file_path}")
-        print(f"\n📊 Boron Zone Distribution:")
-        print(f"   - Green Zone (Sufficient): {zone_stats['Green Zone (Sufficient Boron)']} villages")
-        print(f"   - Red Zone (Deficient): {zone_stats['Red Zone (Deficient Boron)']} villages") 
-        print(f"   - Low Boron: {zone_stats['Low Boron']} villages")
-        print(f"   - Total Updated: {updated_villages_count} villages")
+        print_boron_summary(updated_villages_count, zone_stats)
         
     except IOError as e:
         print(f"Error writing to file {file_path}: {e}")
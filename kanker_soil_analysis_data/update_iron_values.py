@@ -5,61 +5,54 @@ Based on zone classification and realistic calculations
 """
 
 import json
-import random
-from math import radians, sin, cos, sqrt, atan2
-
-def calculate_distance(lat1, lon1, lat2, lon2):
-    """Calculate distance between two points in km using Haversine formula"""
-    R = 6371  # Radius of Earth in kilometers
-
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-
-    a = sin(dlat / 2)**2 + cos(lat1) * cos(lat2) * sin(dlon / 2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+import numpy as np
+
+from json_io import load_json, save_json
+from zone_utils import (
+    village_coordinate_arrays, assign_zones, zone_inputs_digest, sections_present, read_digest,
+    write_digest
+)
+
+# Define Iron Zones with bounding boxes
+IRON_ZONES_BBOX = {
+    "Green Zone (Sufficient Iron)": {
+        "lat_range": (20.16, 20.33),
+        "lon_range": (81.15, 81.49),
+        "iron_level_category": "Sufficient",
+        "iron_range_ppm": (4.5, 15.0),
+        "color": "green",
+        "description": "Most of Kanker tehsil with sufficient iron levels"
+    },
+    "Red Spot (Deficient Iron)": {
+        "lat_range": (20.20, 20.24),
+        "lon_range": (81.14, 81.18),
+        "iron_level_category": "Deficient",
+        "iron_range_ppm": (1.0, 4.5),
+        "color": "red",
+        "description": "Small red spot area with deficient iron levels"
+    }
+}
 
-    distance = R * c
-    return distance
+# Keys apply_iron writes into the document-level sections; other scripts (nitrogen) replace
+# these sections wholesale, so the skip check below needs them present too
+IRON_SECTION_KEYS = {
+    "overall_statistics": ("iron_summary", "iron_zones"),
+    "recommendations": ("iron_recommendations", "zone_wise_iron_strategy"),
+    "data_quality": ("iron_data_source", "iron_zones", "iron_calculation_method")
+}
 
-def update_iron_values():
+def apply_iron(data, rng=None):
     """
-    Update iron values for villages in kanker_complete_soil_analysis_data.json
-    based on defined iron zones.
-    """
-    file_path = 'kanker_complete_soil_analysis_data.json'
+    Assign iron zones and values to villages and add iron statistics,
+    recommendations and data quality notes (mutates data in place, no I/O)
 
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print(f"Error: File not found at {file_path}")
-        return
-    except json.JSONDecodeError:
-        print(f"Error: Could not decode JSON from {file_path}")
-        return
-
-    # Define Iron Zones with bounding boxes
-    iron_zones_bbox = {
-        "Green Zone (Sufficient Iron)": {
-            "lat_range": (20.16, 20.33),
-            "lon_range": (81.15, 81.49),
-            "iron_level_category": "Sufficient",
-            "iron_range_ppm": (4.5, 15.0),
-            "color": "green",
-            "description": "Most of Kanker tehsil with sufficient iron levels"
-        },
-        "Red Spot (Deficient Iron)": {
-            "lat_range": (20.20, 20.24),
-            "lon_range": (81.14, 81.18),
-            "iron_level_category": "Deficient",
-            "iron_range_ppm": (1.0, 4.5),
-            "color": "red",
-            "description": "Small red spot area with deficient iron levels"
-        }
-    }
+    Args:
+        data: Soil analysis data with village_wise_data
+        rng: numpy Generator for the value draws (a fresh default_rng() if None)
 
+    Returns:
+        (updated_villages_count, zone_stats)
+    """
     updated_villages_count = 0
     zone_stats = {
         "Green Zone (Sufficient Iron)": 0,
@@ -68,42 +61,35 @@ def update_iron_values():
     }
     
     if 'village_wise_data' in data and 'villages' in data['village_wise_data']:
-        for village in data['village_wise_data']['villages']:
-            lat, lon = village.get('coordinates', [None, None])
-
-            if lat is None or lon is None:
-                # Skip if coordinates are missing
-                continue
-
-            assigned_zone = "Low Iron"
-            iron_level_category = "Low"
-            estimated_iron_range = (2.0, 4.0) # Default Low
-
-            # Check for Red Spot (Deficient Iron) first (more specific overlap)
-            if (iron_zones_bbox["Red Spot (Deficient Iron)"]["lat_range"][0] <= lat <= iron_zones_bbox["Red Spot (Deficient Iron)"]["lat_range"][1] and
-                iron_zones_bbox["Red Spot (Deficient Iron)"]["lon_range"][0] <= lon <= iron_zones_bbox["Red Spot (Deficient Iron)"]["lon_range"][1]):
-                assigned_zone = "Red Spot (Deficient Iron)"
-                iron_level_category = iron_zones_bbox["Red Spot (Deficient Iron)"]["iron_level_category"]
-                estimated_iron_range = iron_zones_bbox["Red Spot (Deficient Iron)"]["iron_range_ppm"]
-                zone_stats["Red Spot (Deficient Iron)"] += 1
-            # Then check for Green Zone (Sufficient Iron) - covers most of Kanker tehsil
-            elif (iron_zones_bbox["Green Zone (Sufficient Iron)"]["lat_range"][0] <= lat <= iron_zones_bbox["Green Zone (Sufficient Iron)"]["lat_range"][1] and
-                  iron_zones_bbox["Green Zone (Sufficient Iron)"]["lon_range"][0] <= lon <= iron_zones_bbox["Green Zone (Sufficient Iron)"]["lon_range"][1]):
-                assigned_zone = "Green Zone (Sufficient Iron)"
-                iron_level_category = iron_zones_bbox["Green Zone (Sufficient Iron)"]["iron_level_category"]
-                estimated_iron_range = iron_zones_bbox["Green Zone (Sufficient Iron)"]["iron_range_ppm"]
-                zone_stats["Green Zone (Sufficient Iron)"] += 1
-            else:
-                zone_stats["Low Iron"] += 1
-            
-            # Assign iron values
-            min_fe, max_fe = estimated_iron_range
-            estimated_iron = round(random.uniform(min_fe, max_fe), 2)
+        villages, lat, lon = village_coordinate_arrays(data['village_wise_data']['villages'])
+
+        # Zone codes in priority order: Red first (more specific overlap), then Green, else Low
+        zone_names = ("Red Spot (Deficient Iron)", "Green Zone (Sufficient Iron)")
+        zone_codes = assign_zones(lat, lon, [IRON_ZONES_BBOX[name] for name in zone_names])
+
+        # Per-code level category and iron range, the last entry being the Low default
+        categories = [IRON_ZONES_BBOX[name]["iron_level_category"] for name in zone_names] + ["Low"]
+        ranges = np.array([IRON_ZONES_BBOX[name]["iron_range_ppm"] for name in zone_names] + [(2.0, 4.0)])
+        names = zone_names + ("Low Iron",)
+
+        # Assign iron values, one Generator draw and one formatting call for all villages
+        if rng is None:
+            rng = np.random.default_rng()
+        estimated_iron = rng.uniform(ranges[zone_codes, 0], ranges[zone_codes, 1])
+        estimated_iron_text = np.char.mod("%.2f ppm", estimated_iron).tolist()
+
+        for code, count in enumerate(np.bincount(zone_codes, minlength=len(names)).tolist()):
+            zone_stats[names[code]] = count
+
+        for village, code, value in zip(villages, zone_codes.tolist(), estimated_iron_text):
+            assigned_zone = names[code]
+            iron_level_category = categories[code]
 
             village['iron_level'] = iron_level_category
-            village['estimated_iron'] = f"{estimated_iron:.2f} ppm"
+            village['estimated_iron'] = value
             village['iron_zone'] = assigned_zone
-            village['iron_status'] = f"{village['village_name']} has {iron_level_category} iron in {assigned_zone}."
+            # The status sentence is derivable from village_name, iron_level and iron_zone; drop any stale copy
+            village.pop('iron_status', None)
             updated_villages_count += 1
 
     # Update overall statistics and recommendations for iron
@@ -162,16 +148,51 @@ def update_iron_values():
     data['data_quality']['iron_zones'] = "Based on provided Green Zone and Red Spot coordinates"
     data['data_quality']['iron_calculation_method'] = "Bounding box zone assignment + Realistic iron ranges (DTPA Extractable Iron)"
 
+    return updated_villages_count, zone_stats
+
+def print_iron_summary(updated_villages_count, zone_stats):
+    """Print the iron zone distribution returned by apply_iron"""
+    print(f"\n📊 Iron Zone Distribution:")
+    print(f"   - Green Zone (Sufficient): {zone_stats['Green Zone (Sufficient Iron)']} villages")
+    print(f"   - Red Spot (Deficient): {zone_stats['Red Spot (Deficient Iron)']} villages") 
+    print(f"   - Low Iron: {zone_stats['Low Iron']} villages")
+    print(f"   - Total Updated: {updated_villages_count} villages")
+
+def update_iron_values():
+    """
+    Update iron values for villages in kanker_complete_soil_analysis_data.json
+    based on defined iron zones.
+    """
+    file_path = 'kanker_complete_soil_analysis_data.json'
+    cache_path = '.iron_cache'
+
+    try:
+        data = load_json(file_path)
+    except FileNotFoundError:
+        print(f"Error: File not found at {file_path}")
+        return
+    except json.JSONDecodeError:
+        print(f"Error: Could not decode JSON from {file_path}")
+        return
+
+    # Skip the rewrite when zones and village coordinates are unchanged since the last run
+    # and this script's village fields and section entries are all still in place
+    villages, lat, lon = village_coordinate_arrays(data.get('village_wise_data', {}).get('villages', []))
+    inputs_digest = zone_inputs_digest(IRON_ZONES_BBOX, lat, lon)
+    if (inputs_digest == read_digest(cache_path)
+            and all('iron_zone' in village for village in villages)
+            and sections_present(data, IRON_SECTION_KEYS)):
+        print(f"✅ Iron values in {file_path} are up to date ({len(villages)} villages), nothing to rewrite")
+        return
+
+    updated_villages_count, zone_stats = apply_iron(data)
+
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        save_json(file_path, data)
+        write_digest(cache_path, inputs_digest)
         
         print(f"✅ Successfully updated iron values for {updated_villages_count} villages in {file_path}")
-        print(f"\n📊 Iron Zone Distribution:")
-        print(f"   - Green Zone (Sufficient): {zone_stats['Green Zone (Sufficient Iron)']} villages")
-        print(f"   - Red Spot (Deficient): {zone_stats['Red Spot (Deficient Iron)']} villages") 
-        print(f"   - Low Iron: {zone_stats['Low Iron']} villages")
-        print(f"   - Total Updated: {updated_villages_count} villages")
+        print_iron_summary(updated_villages_count, zone_stats)
         
     except IOError as e:
         print(f"Error writing to file {file_path}: {e}")
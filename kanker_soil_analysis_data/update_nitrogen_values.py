@@ -4,80 +4,111 @@ Update nitrogen values in kanker_complete_soil_analysis_data.json
 Based on zone classification and more realistic calculations
 """
 
-import json
-import random
+import os
+import zlib
+from operator import itemgetter
 
-def calculate_realistic_nitrogen(village_name, population, zone, index):
-    """Calculate more realistic nitrogen values based on zone and population"""
-    
-    # Base nitrogen values by zone
-    if zone == "yellow":
-        # Yellow Zone: Low-Medium Nitrogen (280-400 kg/ha)
-        base_nitrogen = 320
-        variance = 40
-        pop_factor = min(population / 2000, 1.5) * 20
-    elif zone == "red":
-        # Red Zone: High/Very High Nitrogen (400-600+ kg/ha)
-        base_nitrogen = 480
-        variance = 60
-        pop_factor = min(population / 2000, 2) * 30
-    else:
-        # Default to yellow zone
-        base_nitrogen = 320
-        variance = 40
-        pop_factor = min(population / 2000, 1.5) * 20
-    
-    # Village name factor for consistency
-    name_hash = hash(village_name) % 100
+import numpy as np
+
+from json_io import load_json, save_json
+
+# Seeded once per run so re-runs reproduce the same values (override with SOIL_SEED)
+RNG = np.random.default_rng(int(os.environ.get('SOIL_SEED', '42')))
+
+# Per-zone nitrogen parameters, indexed by zone code (0 = yellow, 1 = red, 2 = any other zone)
+# Other zones use yellow base values without clamping, and are categorized on the red scale
+ZONE_CODES = {"yellow": 0, "red": 1}
+BASE_NITROGEN = np.array([320, 480, 320], dtype=np.float64)
+NITROGEN_VARIANCE = np.array([40, 60, 40], dtype=np.float64)
+POP_FACTOR_CAP = np.array([1.5, 2, 1.5])
+POP_FACTOR_SCALE = np.array([20, 30, 20], dtype=np.float64)
+NITROGEN_MIN = np.array([280, 400, -np.inf])
+NITROGEN_MAX = np.array([420, 650, np.inf])
+
+# Level categorization: yellow scale (Low < 300 <= Low-Medium < 350 <= Medium) for
+# yellow villages, red scale (Medium < 450 <= High < 550 <= Very High) otherwise
+LEVEL_THRESHOLDS = (np.array([300, 350]), np.array([450, 550]))
+NITROGEN_LEVELS = ("Low", "Low-Medium", "Medium", "Medium", "High", "Very High")
+LEVEL_HALF_WIDTH = np.array([15, 20, 25, 30, 35, 40], dtype=np.float64)
+
+def _status_sentence(size_label, zone, nitrogen_level):
+    """Village status sentence, e.g. Large village in red zone with high nitrogen"""
+    return f"{size_label} village in {zone} zone with {nitrogen_level.lower()} nitrogen"
+
+# Every status sentence for the known zones, keyed (size label, zone, level); villages in
+# any other zone are formatted on demand
+STATUS_SENTENCES = {
+    (size_label, zone, nitrogen_level): _status_sentence(size_label, zone, nitrogen_level)
+    for size_label in ("Large", "Medium", "Small")
+    for zone in ZONE_CODES
+    for nitrogen_level in NITROGEN_LEVELS
+}
+
+def calculate_realistic_nitrogen(village_names, populations, zones, rng=None):
+    """
+    Calculate more realistic nitrogen values based on zone and population, for all villages at once
+    
+    Args:
+        village_names, populations, zones: Per-village sequences (in village order, which
+            also drives the index factor)
+        rng: numpy Generator for the random variation (the module's seeded RNG if None)
+    
+    Returns:
+        (levels, range_strs, values) lists, one entry per village
+    """
+    count = len(village_names)
+    if rng is None:
+        rng = RNG
+    
+    zone_codes = np.fromiter((ZONE_CODES.get(zone, 2) for zone in zones), dtype=np.intp, count=count)
+    populations = np.fromiter(populations, dtype=np.float64, count=count)
+    
+    # Population factor, capped per zone
+    pop_factor = np.minimum(populations / 2000, POP_FACTOR_CAP[zone_codes]) * POP_FACTOR_SCALE[zone_codes]
+    
+    # Village name factor for consistency (CRC32 is stable across runs, unlike the salted str hash())
+    name_hash = np.fromiter(
+        (zlib.crc32(name.encode('utf-8')) % 100 for name in village_names), dtype=np.float64, count=count
+    )
     name_factor = (name_hash - 50) * 2  # -100 to +100
     
     # Index factor for some variation
-    index_factor = (index % 20 - 10) * 3  # -30 to +30
-    
-    # Calculate total nitrogen
-    total_nitrogen = base_nitrogen + pop_factor + name_factor + index_factor
+    index_factor = (np.arange(count) % 20 - 10) * 3  # -30 to +30
     
-    # Add some random variation
-    random_factor = (random.random() - 0.5) * variance
-    total_nitrogen += random_factor
+    # Calculate total nitrogen, plus some random variation
+    total_nitrogen = BASE_NITROGEN[zone_codes] + pop_factor + name_factor + index_factor
+    total_nitrogen += (rng.random(count) - 0.5) * NITROGEN_VARIANCE[zone_codes]
     
     # Ensure within reasonable bounds
-    if zone == "yellow":
-        total_nitrogen = max(280, min(420, total_nitrogen))
-    elif zone == "red":
-        total_nitrogen = max(400, min(650, total_nitrogen))
+    total_nitrogen = np.clip(total_nitrogen, NITROGEN_MIN[zone_codes], NITROGEN_MAX[zone_codes])
     
     # Categorize nitrogen level
-    if zone == "yellow":
-        if total_nitrogen < 300:
-            level = "Low"
-            range_str = f"{int(total_nitrogen-15)}-{int(total_nitrogen+15)} kg/ha"
-        elif total_nitrogen < 350:
-            level = "Low-Medium"
-            range_str = f"{int(total_nitrogen-20)}-{int(total_nitrogen+20)} kg/ha"
-        else:
-            level = "Medium"
-            range_str = f"{int(total_nitrogen-25)}-{int(total_nitrogen+25)} kg/ha"
-    else:  # red zone
-        if total_nitrogen < 450:
-            level = "Medium"
-            range_str = f"{int(total_nitrogen-30)}-{int(total_nitrogen+30)} kg/ha"
-        elif total_nitrogen < 550:
-            level = "High"
-            range_str = f"{int(total_nitrogen-35)}-{int(total_nitrogen+35)} kg/ha"
-        else:
-            level = "Very High"
-            range_str = f"{int(total_nitrogen-40)}-{int(total_nitrogen+40)} kg/ha"
-    
-    return level, range_str, int(total_nitrogen)
+    red_scale = zone_codes != 0
+    level_codes = np.where(
+        red_scale,
+        3 + np.digitize(total_nitrogen, LEVEL_THRESHOLDS[1]),
+        np.digitize(total_nitrogen, LEVEL_THRESHOLDS[0])
+    )
+    half_width = LEVEL_HALF_WIDTH[level_codes]
+    range_lo = (total_nitrogen - half_width).astype(np.int64).tolist()
+    range_hi = (total_nitrogen + half_width).astype(np.int64).tolist()
+    
+    levels = [NITROGEN_LEVELS[code] for code in level_codes.tolist()]
+    range_strs = [f"{lo}-{hi} kg/ha" for lo, hi in zip(range_lo, range_hi)]
+    return levels, range_strs, total_nitrogen.astype(np.int64).tolist()
 
-def update_nitrogen_values():
-    """Update nitrogen values for all villages"""
-    
-    # Load existing data
-    with open('kanker_complete_soil_analysis_data.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
+def apply_nitrogen(data, rng=None):
+    """
+    Update nitrogen values for all villages and replace the overall statistics,
+    recommendations and data quality sections (mutates data in place, no I/O)
+    
+    Args:
+        data: Soil analysis data with village_wise_data
+        rng: numpy Generator for the random variation (the module's seeded RNG if None)
+    
+    Returns:
+        (yellow_count, red_count, nitrogen_stats)
+    """
     yellow_count = 0
     red_count = 0
     nitrogen_stats = {
@@ -88,29 +119,32 @@ def update_nitrogen_values():
         "Very High": 0
     }
     
+    # Calculate new nitrogen values for all villages
+    villages = data['village_wise_data']['villages']
+    populations = list(map(itemgetter('population'), villages))
+    zones = [village.get('zone', 'yellow') for village in villages]
+    nitrogen_levels, nitrogen_ranges, nitrogen_values = calculate_realistic_nitrogen(
+        list(map(itemgetter('village_name'), villages)), populations, zones, rng
+    )
+    
+    # Status sentences for all villages: size label from population, then table lookup
+    size_labels = np.select(
+        [np.asarray(populations) > 2000, np.asarray(populations) > 1000], ["Large", "Medium"], "Small"
+    ).tolist()
+    statuses = [
+        STATUS_SENTENCES.get(key) or _status_sentence(*key)
+        for key in zip(size_labels, zones, nitrogen_levels)
+    ]
+    
     # Update each village
-    for i, village in enumerate(data['village_wise_data']['villages']):
-        village_name = village['village_name']
-        population = village['population']
-        zone = village.get('zone', 'yellow')
-        
-        # Calculate new nitrogen values
-        nitrogen_level, nitrogen_range, nitrogen_value = calculate_realistic_nitrogen(
-            village_name, population, zone, i
-        )
-        
+    for village, zone, nitrogen_level, nitrogen_range, nitrogen_value, status in zip(
+        villages, zones, nitrogen_levels, nitrogen_ranges, nitrogen_values, statuses
+    ):
         # Update village data
         village['nitrogen_level'] = nitrogen_level
         village['estimated_nitrogen'] = nitrogen_range
         village['nitrogen_value'] = nitrogen_value  # Add exact value for reference
-        
-        # Update status
-        if population > 2000:
-            village['status'] = f"Large village in {zone} zone with {nitrogen_level.lower()} nitrogen"
-        elif population > 1000:
-            village['status'] = f"Medium village in {zone} zone with {nitrogen_level.lower()} nitrogen"
-        else:
-            village['status'] = f"Small village in {zone} zone with {nitrogen_level.lower()} nitrogen"
+        village['status'] = status
         
         # Count by zone and level
         if zone == "yellow":
@@ -168,11 +202,10 @@ def update_nitrogen_values():
         "nitrogen_calculation_method": "Population-based + Zone-specific + Name-hash consistency + Realistic variance"
     }
     
-    # Save updated data
-    with open('kanker_complete_soil_analysis_data.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    
-    print("✅ Successfully updated nitrogen values:")
+    return yellow_count, red_count, nitrogen_stats
+
+def print_nitrogen_summary(yellow_count, red_count, nitrogen_stats):
+    """Print the nitrogen zone and level distribution returned by apply_nitrogen"""
     print(f"   - Yellow Zone: {yellow_count} villages")
     print(f"   - Red Zone: {red_count} villages")
     print(f"   - Nitrogen Distribution:")
@@ -181,5 +214,19 @@ def update_nitrogen_values():
     print(f"   - More realistic nitrogen ranges")
     print(f"   - Zone-specific fertilizer recommendations")
 
+def update_nitrogen_values():
+    """Update nitrogen values for all villages"""
+    
+    # Load existing data
+    data = load_json('kanker_complete_soil_analysis_data.json')
+    
+    nitrogen_results = apply_nitrogen(data)
+    
+    # Save updated data
+    save_json('kanker_complete_soil_analysis_data.json', data)
+    
+    print("✅ Successfully updated nitrogen values:")
+    print_nitrogen_summary(*nitrogen_results)
+
 if __name__ == "__main__":
     update_nitrogen_values()
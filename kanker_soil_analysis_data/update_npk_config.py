@@ -5,7 +5,6 @@ Updates npk_config.py with real ICAR data from Kanker district
 """
 
 import json
-import re
 
 def load_icar_results():
     """Load ICAR analysis results"""
@@ -61,6 +60,31 @@ def calculate_corrected_multipliers(icar_data):
     
     return corrected_multipliers
 
+def replace_brace_blocks(content, opening, marker, replacement):
+    """
+    Replace every `opening ... }` block (up to the first closing brace) whose body
+    contains marker with at least one character on either side
+    """
+    parts = []
+    pos = 0
+    start = content.find(opening)
+    
+    while start != -1:
+        end = content.find('}', start + len(opening))
+        if end == -1:
+            break
+        
+        if marker in content[start + len(opening) + 1:end - 1]:
+            parts.append(content[pos:start])
+            parts.append(replacement)
+            pos = end + 1
+            start = content.find(opening, pos)
+        else:
+            start = content.find(opening, start + 1)
+    
+    parts.append(content[pos:])
+    return ''.join(parts)
+
 def update_npk_config_file(multipliers):
     """Update npk_config.py with ICAR-based multipliers"""
     
@@ -88,13 +112,10 @@ def update_npk_config_file(multipliers):
     }},'''
     
     # Find the DISTRICT_CALIBRATION section and add Kanker entry
-    pattern = r'(DISTRICT_CALIBRATION = \{)'
-    replacement = r'\1\n' + kanker_calibration
-    
-    updated_content = re.sub(pattern, replacement, content)
+    anchor = 'DISTRICT_CALIBRATION = {'
+    updated_content = content.replace(anchor, anchor + '\n' + kanker_calibration)
     
     # Also update the LOCAL_CALIBRATION section for Chhattisgarh
-    chhattisgarh_pattern = r'("chhattisgarh": \{[^}]+"accuracy_factor": 0\.85[^}]+})'
     chhattisgarh_replacement = f'''"chhattisgarh": {{
         "nitrogen_multiplier": {multipliers['nitrogen_multiplier']},  # Updated with ICAR data
         "phosphorus_multiplier": {multipliers['phosphorus_multiplier']},  # Updated with ICAR data
@@ -103,7 +124,9 @@ def update_npk_config_file(multipliers):
         "accuracy_factor": 0.92  # Improved with ICAR validation
     }}'''
     
-    updated_content = re.sub(chhattisgarh_pattern, chhattisgarh_replacement, updated_content, flags=re.DOTALL)
+    updated_content = replace_brace_blocks(
+        updated_content, '"chhattisgarh": {', '"accuracy_factor": 0.85', chhattisgarh_replacement
+    )
     
     # Write updated content
     with open('api/working/npk_config.py', 'w') as f:
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Update nitrogen, phosphorus, boron, iron, potassium, soil pH and zinc values and restructure
+kanker_complete_soil_analysis_data.json in a single pass: the file is read and
+written once instead of once per script
+"""
+
+import json
+import os
+
+import numpy as np
+
+from json_io import load_json, save_json
+from update_nitrogen_values import apply_nitrogen, print_nitrogen_summary
+from update_phosphorus_values import apply_phosphorus, print_phosphorus_summary
+from update_boron_values import apply_boron, print_boron_summary
+from update_iron_values import apply_iron, print_iron_summary
+from update_potassium_values import apply_potassium, print_potassium_summary
+from update_soil_ph_values import apply_soil_ph, print_soil_ph_summary
+from update_zinc_values import apply_zinc, print_zinc_summary
+from restructure_data import apply_restructure
+
+def update_nutrients():
+    """
+    Run the nitrogen, phosphorus, boron, iron, potassium, soil pH and zinc updates and the restructure step
+    on one in-memory copy of the soil analysis data, then save it.
+    """
+    file_path = 'kanker_complete_soil_analysis_data.json'
+
+    try:
+        data = load_json(file_path)
+    except FileNotFoundError:
+        print(f"Error: File not found at {file_path}")
+        return
+    except json.JSONDecodeError:
+        print(f"Error: Could not decode JSON from {file_path}")
+        return
+
+    # One seeded generator shared by every step: reproducible, and no two nutrients
+    # replay the same random stream
+    rng = np.random.default_rng(int(os.environ.get('SOIL_SEED', '42')))
+
+    # Nutrient updates work on the raw village list, so restructure last. Nitrogen
+    # replaces the statistics/recommendation sections the others add to, so it goes first
+    nitrogen_results = apply_nitrogen(data, rng)
+    phosphorus_results = apply_phosphorus(data, rng)
+    boron_results = apply_boron(data, rng)
+    iron_results = apply_iron(data, rng)
+    potassium_results = apply_potassium(data, rng)
+    soil_ph_results = apply_soil_ph(data, rng)
+    zinc_results = apply_zinc(data, rng)
+    restructured_data = apply_restructure(data)
+
+    try:
+        save_json(file_path, restructured_data)
+
+        print(f"✅ Successfully updated nitrogen, phosphorus, boron, iron, potassium, soil pH and zinc values and restructured {file_path}")
+        print(f"\n📊 Nitrogen Zones:")
+        print_nitrogen_summary(*nitrogen_results)
+        print_phosphorus_summary(*phosphorus_results)
+        print_boron_summary(*boron_results)
+        print_iron_summary(*iron_results)
+        print_potassium_summary(*potassium_results)
+        print_soil_ph_summary(*soil_ph_results)
+        print_zinc_summary(*zinc_results)
+        print(f"\n   - Total Villages: {len(restructured_data['village_data']['villages'])}")
+
+    except IOError as e:
+        print(f"Error writing to file {file_path}: {e}")
+
+if __name__ == "__main__":
+    update_nutrients()
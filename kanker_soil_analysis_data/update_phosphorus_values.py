@@ -5,40 +5,31 @@ Based on zone classification and realistic calculations
 """
 
 import json
-import random
-from math import radians, sin, cos, sqrt, atan2
+import os
+from itertools import compress
 
-def calculate_distance(lat1, lon1, lat2, lon2):
-    """Calculate distance between two points in km using Haversine formula"""
-    R = 6371  # Radius of Earth in kilometers
+import numpy as np
 
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+from geo_utils import calculate_distances
+from json_io import load_json, save_json
 
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
+# Seeded once per run so re-runs reproduce the same values (override with SOIL_SEED)
+RNG = np.random.default_rng(int(os.environ.get('SOIL_SEED', '42')))
 
-    a = sin(dlat / 2)**2 + cos(lat1) * cos(lat2) * sin(dlon / 2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+def apply_phosphorus(data, rng=None):
+    """
+    Assign phosphorus zones and values to villages and add phosphorus statistics,
+    recommendations and data quality notes (mutates data in place, no I/O)
 
-    distance = R * c
-    return distance
+    Args:
+        data: Soil analysis data with village_wise_data
+        rng: numpy Generator for the range draws (the module's seeded RNG if None)
 
-def update_phosphorus_values():
-    """
-    Update phosphorus values for villages in kanker_complete_soil_analysis_data.json
-    based on defined phosphorus zones.
+    Returns:
+        (updated_villages_count, zone_stats)
     """
-    file_path = 'kanker_complete_soil_analysis_data.json'
-
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print(f"Error: File not found at {file_path}")
-        return
-    except json.JSONDecodeError:
-        print(f"Error: Could not decode JSON from {file_path}")
-        return
+    if rng is None:
+        rng = RNG
 
     # Define Phosphorus Zones (using approximate center points and a radius)
     # Radius in km for a small zone around the given coordinate
@@ -69,44 +60,68 @@ def update_phosphorus_values():
     }
     
     if 'village_wise_data' in data and 'villages' in data['village_wise_data']:
-        for village in data['village_wise_data']['villages']:
-            village_lat = village.get('coordinates', [None, None])[0]
-            village_lon = village.get('coordinates', [None, None])[1]
-            village_tehsil = village.get('tehsil')
-
-            # Only update villages within "Kanker" tehsil for these specific zones
-            if village_lat is not None and village_lon is not None and village_tehsil == "Kanker":
-                assigned_phosphorus_level = "Low"
-                assigned_phosphorus_range = f"{random.randint(8, 15)}-{random.randint(15, 20)} kg/ha"
-                assigned_zone = "Low Phosphorus"
-
-                # Check distance to each phosphorus zone
-                for zone_name, zone_info in phosphorus_zones.items():
-                    dist = calculate_distance(village_lat, village_lon, 
-                                              zone_info["center_lat"], zone_info["center_lon"])
-                    
-                    if dist <= ZONE_RADIUS_KM:
-                        assigned_phosphorus_level = zone_info["level"]
-                        min_val = zone_info["range_min"]
-                        max_val = zone_info["range_max"]
-                        assigned_phosphorus_range = f"{random.randint(min_val, min_val + 3)}-{random.randint(max_val - 3, max_val)} kg/ha"
-                        assigned_zone = zone_name
-                        zone_stats[zone_name] += 1
-                        break # Assign to the first matching zone
-
-                if assigned_zone == "Low Phosphorus":
-                    zone_stats["Low Phosphorus"] += 1
-
-                village['phosphorus_level'] = assigned_phosphorus_level
-                village['estimated_phosphorus'] = assigned_phosphorus_range
-                village['phosphorus_zone'] = assigned_zone
-                updated_villages_count += 1
-            else:
-                # For villages outside Kanker tehsil or without coordinates
-                if 'phosphorus_level' not in village:
-                    village['phosphorus_level'] = "Low"
-                    village['estimated_phosphorus'] = f"{random.randint(8, 15)}-{random.randint(15, 20)} kg/ha"
-                    village['phosphorus_zone'] = "Low Phosphorus"
+        villages = data['village_wise_data']['villages']
+        zone_names = list(phosphorus_zones)
+
+        # Only update villages within "Kanker" tehsil for these specific zones: one mask
+        # over coordinate and tehsil columns (missing coordinates become NaN)
+        coords = np.array(
+            [village.get('coordinates', [None, None])[:2] for village in villages], dtype=np.float64
+        ).reshape(-1, 2)
+        tehsils = np.array([village.get('tehsil') for village in villages], dtype=object)
+        in_kanker = ~np.isnan(coords).any(axis=1) & (tehsils == "Kanker")
+
+        # Distance from each Kanker village to each zone center in one call; villages take
+        # the first zone (in definition order) within the radius, len(zone_names) if none
+        distances = calculate_distances(
+            coords[in_kanker, 0], coords[in_kanker, 1],
+            [phosphorus_zones[name]["center_lat"] for name in zone_names],
+            [phosphorus_zones[name]["center_lon"] for name in zone_names]
+        )
+        within_radius = distances <= ZONE_RADIUS_KM
+
+        # Zone code per village; villages outside Kanker or without coordinates get the Low code
+        zone_codes = np.full(len(villages), len(zone_names), dtype=np.intp)
+        zone_codes[in_kanker] = np.where(
+            within_radius.any(axis=1), within_radius.argmax(axis=1), len(zone_names)
+        )
+
+        # Inclusive bounds for the low and high end of each zone's range string, Low last;
+        # both ends drawn for all villages at once
+        range_bounds = np.array(
+            [(info["range_min"], info["range_min"] + 3, info["range_max"] - 3, info["range_max"])
+             for info in phosphorus_zones.values()] + [(8, 15, 15, 20)]
+        )[zone_codes]
+        range_lo = rng.integers(range_bounds[:, 0], range_bounds[:, 1], endpoint=True)
+        range_hi = rng.integers(range_bounds[:, 2], range_bounds[:, 3], endpoint=True)
+
+        zone_levels = [info["level"] for info in phosphorus_zones.values()] + ["Low"]
+        zone_names.append("Low Phosphorus")
+
+        kanker_codes = zone_codes[in_kanker]
+        for code, count in enumerate(np.bincount(kanker_codes, minlength=len(zone_names)).tolist()):
+            zone_stats[zone_names[code]] = count
+
+        for village, code, lo, hi in zip(
+            compress(villages, in_kanker), kanker_codes.tolist(),
+            range_lo[in_kanker].tolist(), range_hi[in_kanker].tolist()
+        ):
+            assigned_zone = zone_names[code]
+
+            village['phosphorus_level'] = zone_levels[code]
+            village['estimated_phosphorus'] = f"{lo}-{hi} kg/ha"
+            village['phosphorus_zone'] = assigned_zone
+            updated_villages_count += 1
+
+        # For villages outside Kanker tehsil or without coordinates
+        outside = ~in_kanker
+        for village, lo, hi in zip(
+            compress(villages, outside), range_lo[outside].tolist(), range_hi[outside].tolist()
+        ):
+            if 'phosphorus_level' not in village:
+                village['phosphorus_level'] = "Low"
+                village['estimated_phosphorus'] = f"{lo}-{hi} kg/ha"
+                village['phosphorus_zone'] = "Low Phosphorus"
 
     # Update overall statistics and recommendations for phosphorus
     if 'overall_statistics' not in data:
@@ -162,16 +177,39 @@ def update_phosphorus_values():
     data['data_quality']['phosphorus_zones'] = "Based on provided Yellow Zone and Green Zone coordinates"
     data['data_quality']['phosphorus_calculation_method'] = "Distance-based zone assignment + Realistic phosphorus ranges"
 
+    return updated_villages_count, zone_stats
+
+def print_phosphorus_summary(updated_villages_count, zone_stats):
+    """Print the phosphorus zone distribution returned by apply_phosphorus"""
+    print(f"\n📊 Phosphorus Zone Distribution:")
+    print(f"   - Yellow Zone (Medium): {zone_stats['Yellow #1 (Medium Phosphorus)']} villages")
+    print(f"   - Green Zone (High): {zone_stats['Green #1 (High Phosphorus)']} villages") 
+    print(f"   - Low Phosphorus: {zone_stats['Low Phosphorus']} villages")
+    print(f"   - Total Updated: {updated_villages_count} villages")
+
+def update_phosphorus_values():
+    """
+    Update phosphorus values for villages in kanker_complete_soil_analysis_data.json
+    based on defined phosphorus zones.
+    """
+    file_path = 'kanker_complete_soil_analysis_data.json'
+
+    try:
+        data = load_json(file_path)
+    except FileNotFoundError:
+        print(f"Error: File not found at {file_path}")
+        return
+    except json.JSONDecodeError:
+        print(f"Error: Could not decode JSON from {file_path}")
+        return
+
+    updated_villages_count, zone_stats = apply_phosphorus(data)
+
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        save_json(file_path, data)
         
         print(f"✅ Successfully updated phosphorus values for {updated_villages_count} villages in {file_path}")
-        print(f"\n📊 Phosphorus Zone Distribution:")
-        print(f"   - Yellow Zone (Medium): {zone_stats['Yellow #1 (Medium Phosphorus)']} villages")
-        print(f"   - Green Zone (High): {zone_stats['Green #1 (High Phosphorus)']} villages") 
-        print(f"   - Low Phosphorus: {zone_stats['Low Phosphorus']} villages")
-        print(f"   - Total Updated: {updated_villages_count} villages")
+        print_phosphorus_summary(updated_villages_count, zone_stats)
         
     except IOError as e:
         print(f"Error writing to file {file_path}: {e}")
@@ -5,61 +5,54 @@ Based on zone classification and realistic calculations
 """
 
 import json
-import random
-from math import radians, sin, cos, sqrt, atan2
-
-def calculate_distance(lat1, lon1, lat2, lon2):
-    """Calculate distance between two points in km using Haversine formula"""
-    R = 6371  # Radius of Earth in kilometers
-
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-
-    a = sin(dlat / 2)**2 + cos(lat1) * cos(lat2) * sin(dlon / 2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+import numpy as np
+
+from json_io import load_json, save_json
+from zone_utils import (
+    village_coordinate_arrays, assign_zones, zone_inputs_digest, sections_present, read_digest,
+    write_digest
+)
+
+# Define Potassium Zones with bounding boxes
+POTASSIUM_ZONES_BBOX = {
+    "Green (Forest)": {
+        "lat_range": (20.16, 20.33),
+        "lon_range": (81.27, 81.49),
+        "potassium_level_category": "High",
+        "potassium_range_kg_ha": (180, 250),
+        "color": "green",
+        "description": "Forest areas with high potassium"
+    },
+    "Yellow (Plain)": {
+        "lat_range": (20.22, 20.30),
+        "lon_range": (81.21, 81.49),
+        "potassium_level_category": "Medium",
+        "potassium_range_kg_ha": (120, 180),
+        "color": "yellow",
+        "description": "Plain agricultural areas with medium potassium"
+    }
+}
 
-    distance = R * c
-    return distance
+# Keys apply_potassium writes into the document-level sections; other scripts (nitrogen) replace
+# these sections wholesale, so the skip check below needs them present too
+POTASSIUM_SECTION_KEYS = {
+    "overall_statistics": ("potassium_summary", "potassium_zones"),
+    "recommendations": ("potassium_recommendations", "zone_wise_potassium_strategy"),
+    "data_quality": ("potassium_data_source", "potassium_zones", "potassium_calculation_method")
+}
 
-def update_potassium_values():
+def apply_potassium(data, rng=None):
     """
-    Update potassium values for villages in kanker_complete_soil_analysis_data.json
-    based on defined potassium zones.
-    """
-    file_path = 'kanker_complete_soil_analysis_data.json'
-
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print(f"Error: File not found at {file_path}")
-        return
-    except json.JSONDecodeError:
-        print(f"Error: Could not decode JSON from {file_path}")
-        return
+    Assign potassium zones and values to villages and add potassium statistics,
+    recommendations and data quality notes (mutates data in place, no I/O)
 
-    # Define Potassium Zones with bounding boxes
-    potassium_zones_bbox = {
-        "Green (Forest)": {
-            "lat_range": (20.16, 20.33),
-            "lon_range": (81.27, 81.49),
-            "potassium_level_category": "High",
-            "potassium_range_kg_ha": (180, 250),
-            "color": "green",
-            "description": "Forest areas with high potassium"
-        },
-        "Yellow (Plain)": {
-            "lat_range": (20.22, 20.30),
-            "lon_range": (81.21, 81.49),
-            "potassium_level_category": "Medium",
-            "potassium_range_kg_ha": (120, 180),
-            "color": "yellow",
-            "description": "Plain agricultural areas with medium potassium"
-        }
-    }
+    Args:
+        data: Soil analysis data with village_wise_data
+        rng: numpy Generator for the value draws (a fresh default_rng() if None)
 
+    Returns:
+        (updated_villages_count, zone_stats)
+    """
     updated_villages_count = 0
     zone_stats = {
         "Green (Forest)": 0,
@@ -68,42 +61,38 @@ def update_potassium_values():
     }
     
     if 'village_wise_data' in data and 'villages' in data['village_wise_data']:
-        for village in data['village_wise_data']['villages']:
-            lat, lon = village.get('coordinates', [None, None])
-
-            if lat is None or lon is None:
-                # Skip if coordinates are missing
-                continue
-
-            assigned_zone = "Low Potassium"
-            potassium_level_category = "Low"
-            estimated_potassium_range = (80, 120) # Default Low
-
-            # Check for Yellow (Plain) zone first (more specific overlap)
-            if (potassium_zones_bbox["Yellow (Plain)"]["lat_range"][0] <= lat <= potassium_zones_bbox["Yellow (Plain)"]["lat_range"][1] and
-                potassium_zones_bbox["Yellow (Plain)"]["lon_range"][0] <= lon <= potassium_zones_bbox["Yellow (Plain)"]["lon_range"][1]):
-                assigned_zone = "Yellow (Plain) Zone"
-                potassium_level_category = potassium_zones_bbox["Yellow (Plain)"]["potassium_level_category"]
-                estimated_potassium_range = potassium_zones_bbox["Yellow (Plain)"]["potassium_range_kg_ha"]
-                zone_stats["Yellow (Plain)"] += 1
-            # Then check for Green (Forest) zone
-            elif (potassium_zones_bbox["Green (Forest)"]["lat_range"][0] <= lat <= potassium_zones_bbox["Green (Forest)"]["lat_range"][1] and
-                  potassium_zones_bbox["Green (Forest)"]["lon_range"][0] <= lon <= potassium_zones_bbox["Green (Forest)"]["lon_range"][1]):
-                assigned_zone = "Green (Forest) Zone"
-                potassium_level_category = potassium_zones_bbox["Green (Forest)"]["potassium_level_category"]
-                estimated_potassium_range = potassium_zones_bbox["Green (Forest)"]["potassium_range_kg_ha"]
-                zone_stats["Green (Forest)"] += 1
-            else:
-                zone_stats["Low Potassium"] += 1
-            
-            # Assign potassium values
-            min_k, max_k = estimated_potassium_range
-            estimated_potassium = round(random.uniform(min_k, max_k), 2)
+        villages, lat, lon = village_coordinate_arrays(data['village_wise_data']['villages'])
+
+        # Zone codes in priority order: Yellow (Plain) first (more specific overlap), then Green (Forest), else Low
+        zone_keys = ("Yellow (Plain)", "Green (Forest)")
+        zone_codes = assign_zones(lat, lon, [POTASSIUM_ZONES_BBOX[key] for key in zone_keys])
+
+        # Per-code stats key, assigned zone name, level category and potassium range, the last entry being the Low default
+        stats_keys = zone_keys + ("Low Potassium",)
+        names = tuple(f"{key} Zone" for key in zone_keys) + ("Low Potassium",)
+        categories = [POTASSIUM_ZONES_BBOX[key]["potassium_level_category"] for key in zone_keys] + ["Low"]
+        ranges = np.array([POTASSIUM_ZONES_BBOX[key]["potassium_range_kg_ha"] for key in zone_keys] + [(80, 120)], dtype=np.float64)
+
+        # Assign potassium values, one Generator draw and one formatting call for all villages
+        if rng is None:
+            rng = np.random.default_rng()
+        estimated_potassium = np.round(rng.uniform(ranges[zone_codes, 0], ranges[zone_codes, 1]), 2)
+        estimated_potassium_text = np.char.mod("%.0f kg/ha", estimated_potassium).tolist()
+
+        # Status sentence tail per zone code; only the village name varies within a zone
+        status_suffixes = [f" has {category} potassium in {name}." for category, name in zip(categories, names)]
+
+        for code, count in enumerate(np.bincount(zone_codes, minlength=len(names)).tolist()):
+            zone_stats[stats_keys[code]] = count
+
+        for village, code, value in zip(villages, zone_codes.tolist(), estimated_potassium_text):
+            assigned_zone = names[code]
+            potassium_level_category = categories[code]
 
             village['potassium_level'] = potassium_level_category
-            village['estimated_potassium'] = f"{estimated_potassium:.0f} kg/ha"
+            village['estimated_potassium'] = value
             village['potassium_zone'] = assigned_zone
-            village['potassium_status'] = f"{village['village_name']} has {potassium_level_category} potassium in {assigned_zone}."
+            village['potassium_status'] = village['village_name'] + status_suffixes[code]
             updated_villages_count += 1
 
     # Update overall statistics and recommendations for potassium
@@ -162,16 +151,51 @@ def update_potassium_values():
     data['data_quality']['potassium_zones'] = "Based on provided Green (Forest) and Yellow (Plain) zone coordinates"
     data['data_quality']['potassium_calculation_method'] = "Bounding box zone assignment + Realistic potassium ranges"
 
+    return updated_villages_count, zone_stats
+
+def print_potassium_summary(updated_villages_count, zone_stats):
+    """Print the potassium zone distribution returned by apply_potassium"""
+    print(f"\n📊 Potassium Zone Distribution:")
+    print(f"   - Green (Forest) Zone: {zone_stats['Green (Forest)']} villages")
+    print(f"   - Yellow (Plain) Zone: {zone_stats['Yellow (Plain)']} villages") 
+    print(f"   - Low Potassium: {zone_stats['Low Potassium']} villages")
+    print(f"   - Total Updated: {updated_villages_count} villages")
+
+def update_potassium_values():
+    """
+    Update potassium values for villages in kanker_complete_soil_analysis_data.json
+    based on defined potassium zones.
+    """
+    file_path = 'kanker_complete_soil_analysis_data.json'
+    cache_path = '.potassium_cache'
+
+    try:
+        data = load_json(file_path)
+    except FileNotFoundError:
+        print(f"Error: File not found at {file_path}")
+        return
+    except json.JSONDecodeError:
+        print(f"Error: Could not decode JSON from {file_path}")
+        return
+
+    # Skip the rewrite when zones and village coordinates are unchanged since the last run
+    # and this script's village fields and section entries are all still in place
+    villages, lat, lon = village_coordinate_arrays(data.get('village_wise_data', {}).get('villages', []))
+    inputs_digest = zone_inputs_digest(POTASSIUM_ZONES_BBOX, lat, lon)
+    if (inputs_digest == read_digest(cache_path)
+            and all('potassium_zone' in village for village in villages)
+            and sections_present(data, POTASSIUM_SECTION_KEYS)):
+        print(f"✅ Potassium values in {file_path} are up to date ({len(villages)} villages), nothing to rewrite")
+        return
+
+    updated_villages_count, zone_stats = apply_potassium(data)
+
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        save_json(file_path, data)
+        write_digest(cache_path, inputs_digest)
         
         print(f"✅ Successfully updated potassium values for {updated_villages_count} villages in {file_path}")
-        print(f"\n📊 Potassium Zone Distribution:")
-        print(f"   - Green (Forest) Zone: {zone_stats['Green (Forest)']} villages")
-        print(f"   - Yellow (Plain) Zone: {zone_stats['Yellow (Plain)']} villages") 
-        print(f"   - Low Potassium: {zone_stats['Low Potassium']} villages")
-        print(f"   - Total Updated: {updated_villages_count} villages")
+        print_potassium_summary(updated_villages_count, zone_stats)
         
     except IOError as e:
         print(f"Error writing to file {file_path}: {e}")
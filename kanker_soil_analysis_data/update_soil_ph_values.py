@@ -5,69 +5,62 @@ Based on zone classification and realistic calculations
 """
 
 import json
-import random
-from math import radians, sin, cos, sqrt, atan2
-
-def calculate_distance(lat1, lon1, lat2, lon2):
-    """Calculate distance between two points in km using Haversine formula"""
-    R = 6371  # Radius of Earth in kilometers
-
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-
-    a = sin(dlat / 2)**2 + cos(lat1) * cos(lat2) * sin(dlon / 2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+import numpy as np
+
+from json_io import load_json, save_json
+from zone_utils import (
+    village_coordinate_arrays, assign_zones, zone_inputs_digest, sections_present, read_digest,
+    write_digest
+)
+
+# Define Soil pH Zones with bounding boxes
+SOIL_PH_ZONES_BBOX = {
+    "Green Zone (Normal pH)": {
+        "lat_range": (20.20, 20.32),
+        "lon_range": (81.15, 81.40),
+        "ph_level_category": "Normal",
+        "ph_range": (6.5, 7.5),
+        "color": "green",
+        "description": "Forest cover, dense vegetation with normal soil pH"
+    },
+    "Orange Zone (Slightly Acidic)": {
+        "lat_range": (20.17, 20.30),
+        "lon_range": (81.21, 81.49),
+        "ph_level_category": "Slightly Acidic",
+        "ph_range": (5.5, 6.5),
+        "color": "orange",
+        "description": "Cultivated land, open area with slightly acidic soil pH"
+    },
+    "Grey Zone (Moderately Acidic)": {
+        "lat_range": (20.20, 20.24),
+        "lon_range": (81.35, 81.41),
+        "ph_level_category": "Moderately Acidic",
+        "ph_range": (4.5, 5.5),
+        "color": "grey",
+        "description": "Special features, mining zone with moderately acidic soil pH"
+    }
+}
 
-    distance = R * c
-    return distance
+# Keys apply_soil_ph writes into the document-level sections; other scripts (nitrogen) replace
+# these sections wholesale, so the skip check below needs them present too
+SOIL_PH_SECTION_KEYS = {
+    "overall_statistics": ("soil_ph_summary", "soil_ph_zones"),
+    "recommendations": ("soil_ph_recommendations", "zone_wise_ph_strategy"),
+    "data_quality": ("soil_ph_data_source", "soil_ph_zones", "soil_ph_calculation_method")
+}
 
-def update_soil_ph_values():
+def apply_soil_ph(data, rng=None):
     """
-    Update soil pH values for villages in kanker_complete_soil_analysis_data.json
-    based on defined soil pH zones.
-    """
-    file_path = 'kanker_complete_soil_analysis_data.json'
-
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print(f"Error: File not found at {file_path}")
-        return
-    except json.JSONDecodeError:
-        print(f"Error: Could not decode JSON from {file_path}")
-        return
+    Assign soil pH zones and values to villages and add soil pH statistics,
+    recommendations and data quality notes (mutates data in place, no I/O)
 
-    # Define Soil pH Zones with bounding boxes
-    soil_ph_zones_bbox = {
-        "Green Zone (Normal pH)": {
-            "lat_range": (20.20, 20.32),
-            "lon_range": (81.15, 81.40),
-            "ph_level_category": "Normal",
-            "ph_range": (6.5, 7.5),
-            "color": "green",
-            "description": "Forest cover, dense vegetation with normal soil pH"
-        },
-        "Orange Zone (Slightly Acidic)": {
-            "lat_range": (20.17, 20.30),
-            "lon_range": (81.21, 81.49),
-            "ph_level_category": "Slightly Acidic",
-            "ph_range": (5.5, 6.5),
-            "color": "orange",
-            "description": "Cultivated land, open area with slightly acidic soil pH"
-        },
-        "Grey Zone (Moderately Acidic)": {
-            "lat_range": (20.20, 20.24),
-            "lon_range": (81.35, 81.41),
-            "ph_level_category": "Moderately Acidic",
-            "ph_range": (4.5, 5.5),
-            "color": "grey",
-            "description": "Special features, mining zone with moderately acidic soil pH"
-        }
-    }
+    Args:
+        data: Soil analysis data with village_wise_data
+        rng: numpy Generator for the value draws (a fresh default_rng() if None)
 
+    Returns:
+        (updated_villages_count, zone_stats)
+    """
     updated_villages_count = 0
     zone_stats = {
         "Green Zone (Normal pH)": 0,
@@ -77,49 +70,37 @@ def update_soil_ph_values():
     }
     
     if 'village_wise_data' in data and 'villages' in data['village_wise_data']:
-        for village in data['village_wise_data']['villages']:
-            lat, lon = village.get('coordinates', [None, None])
-
-            if lat is None or lon is None:
-                # Skip if coordinates are missing
-                continue
-
-            assigned_zone = "Low pH"
-            ph_level_category = "Low"
-            estimated_ph_range = (4.0, 5.0) # Default Low
-
-            # Check for Grey Zone first (most specific overlap)
-            if (soil_ph_zones_bbox["Grey Zone (Moderately Acidic)"]["lat_range"][0] <= lat <= soil_ph_zones_bbox["Grey Zone (Moderately Acidic)"]["lat_range"][1] and
-                soil_ph_zones_bbox["Grey Zone (Moderately Acidic)"]["lon_range"][0] <= lon <= soil_ph_zones_bbox["Grey Zone (Moderately Acidic)"]["lon_range"][1]):
-                assigned_zone = "Grey Zone (Moderately Acidic)"
-                ph_level_category = soil_ph_zones_bbox["Grey Zone (Moderately Acidic)"]["ph_level_category"]
-                estimated_ph_range = soil_ph_zones_bbox["Grey Zone (Moderately Acidic)"]["ph_range"]
-                zone_stats["Grey Zone (Moderately Acidic)"] += 1
-            # Check for Green Zone
-            elif (soil_ph_zones_bbox["Green Zone (Normal pH)"]["lat_range"][0] <= lat <= soil_ph_zones_bbox["Green Zone (Normal pH)"]["lat_range"][1] and
-                  soil_ph_zones_bbox["Green Zone (Normal pH)"]["lon_range"][0] <= lon <= soil_ph_zones_bbox["Green Zone (Normal pH)"]["lon_range"][1]):
-                assigned_zone = "Green Zone (Normal pH)"
-                ph_level_category = soil_ph_zones_bbox["Green Zone (Normal pH)"]["ph_level_category"]
-                estimated_ph_range = soil_ph_zones_bbox["Green Zone (Normal pH)"]["ph_range"]
-                zone_stats["Green Zone (Normal pH)"] += 1
-            # Check for Orange Zone
-            elif (soil_ph_zones_bbox["Orange Zone (Slightly Acidic)"]["lat_range"][0] <= lat <= soil_ph_zones_bbox["Orange Zone (Slightly Acidic)"]["lat_range"][1] and
-                  soil_ph_zones_bbox["Orange Zone (Slightly Acidic)"]["lon_range"][0] <= lon <= soil_ph_zones_bbox["Orange Zone (Slightly Acidic)"]["lon_range"][1]):
-                assigned_zone = "Orange Zone (Slightly Acidic)"
-                ph_level_category = soil_ph_zones_bbox["Orange Zone (Slightly Acidic)"]["ph_level_category"]
-                estimated_ph_range = soil_ph_zones_bbox["Orange Zone (Slightly Acidic)"]["ph_range"]
-                zone_stats["Orange Zone (Slightly Acidic)"] += 1
-            else:
-                zone_stats["Low pH"] += 1
-            
-            # Assign pH values
-            min_ph, max_ph = estimated_ph_range
-            estimated_ph = round(random.uniform(min_ph, max_ph), 2)
+        villages, lat, lon = village_coordinate_arrays(data['village_wise_data']['villages'])
+
+        # Zone codes in priority order: Grey first (most specific overlap), then Green, then Orange, else Low
+        zone_names = ("Grey Zone (Moderately Acidic)", "Green Zone (Normal pH)", "Orange Zone (Slightly Acidic)")
+        zone_codes = assign_zones(lat, lon, [SOIL_PH_ZONES_BBOX[name] for name in zone_names])
+
+        # Per-code level category and pH range, the last entry being the Low default
+        categories = [SOIL_PH_ZONES_BBOX[name]["ph_level_category"] for name in zone_names] + ["Low"]
+        ranges = np.array([SOIL_PH_ZONES_BBOX[name]["ph_range"] for name in zone_names] + [(4.0, 5.0)])
+        names = zone_names + ("Low pH",)
+
+        # Assign pH values, one Generator draw and one formatting call for all villages
+        if rng is None:
+            rng = np.random.default_rng()
+        estimated_ph = rng.uniform(ranges[zone_codes, 0], ranges[zone_codes, 1])
+        estimated_ph_text = np.char.mod("%.2f", estimated_ph).tolist()
+
+        # Status sentence tail per zone code; only the village name varies within a zone
+        status_suffixes = [f" has {category} soil pH in {name}." for category, name in zip(categories, names)]
+
+        for code, count in enumerate(np.bincount(zone_codes, minlength=len(names)).tolist()):
+            zone_stats[names[code]] = count
+
+        for village, code, value in zip(villages, zone_codes.tolist(), estimated_ph_text):
+            assigned_zone = names[code]
+            ph_level_category = categories[code]
 
             village['soil_ph_level'] = ph_level_category
-            village['estimated_soil_ph'] = f"{estimated_ph:.2f}"
+            village['estimated_soil_ph'] = value
             village['soil_ph_zone'] = assigned_zone
-            village['soil_ph_status'] = f"{village['village_name']} has {ph_level_category} soil pH in {assigned_zone}."
+            village['soil_ph_status'] = village['village_name'] + status_suffixes[code]
             updated_villages_count += 1
 
     # Update overall statistics and recommendations for soil pH
@@ -190,17 +171,52 @@ def update_soil_ph_values():
     data['data_quality']['soil_ph_zones'] = "Based on provided Green, Orange, and Grey zone coordinates"
     data['data_quality']['soil_ph_calculation_method'] = "Bounding box zone assignment + Realistic pH ranges"
 
+    return updated_villages_count, zone_stats
+
+def print_soil_ph_summary(updated_villages_count, zone_stats):
+    """Print the soil pH zone distribution returned by apply_soil_ph"""
+    print(f"\n📊 Soil pH Zone Distribution:")
+    print(f"   - Green Zone (Normal): {zone_stats['Green Zone (Normal pH)']} villages")
+    print(f"   - Orange Zone (Slightly Acidic): {zone_stats['Orange Zone (Slightly Acidic)']} villages")
+    print(f"   - Grey Zone (Moderately Acidic): {zone_stats['Grey Zone (Moderately Acidic)']} villages")
+    print(f"   - Low pH: {zone_stats['Low pH']} villages")
+    print(f"   - Total Updated: {updated_villages_count} villages")
+
+def update_soil_ph_values():
+    """
+    Update soil pH values for villages in kanker_complete_soil_analysis_data.json
+    based on defined soil pH zones.
+    """
+    file_path = 'kanker_complete_soil_analysis_data.json'
+    cache_path = '.soil_ph_cache'
+
+    try:
+        data = load_json(file_path)
+    except FileNotFoundError:
+        print(f"Error: File not found at {file_path}")
+        return
+    except json.JSONDecodeError:
+        print(f"Error: Could not decode JSON from {file_path}")
+        return
+
+    # Skip the rewrite when zones and village coordinates are unchanged since the last run
+    # and this script's village fields and section entries are all still in place
+    villages, lat, lon = village_coordinate_arrays(data.get('village_wise_data', {}).get('villages', []))
+    inputs_digest = zone_inputs_digest(SOIL_PH_ZONES_BBOX, lat, lon)
+    if (inputs_digest == read_digest(cache_path)
+            and all('soil_ph_zone' in village for village in villages)
+            and sections_present(data, SOIL_PH_SECTION_KEYS)):
+        print(f"✅ Soil pH values in {file_path} are up to date ({len(villages)} villages), nothing to rewrite")
+        return
+
+    updated_villages_count, zone_stats = apply_soil_ph(data)
+
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        save_json(file_path, data)
+        write_digest(cache_path, inputs_digest)
         
         print(f"✅ Successfully updated soil pH values for {updated_villages_count} villages in {file_path}")
-        print(f"\n📊 Soil pH Zone Distribution:")
-        print(f"   - Green Zone (Normal): {zone_stats['Green Zone (Normal pH)']} villages")
-        print(f"   - Orange Zone (Slightly Acidic): {zone_stats['Orange Zone (Slightly Acidic)']} villages")
-        print(f"   - Grey Zone (Moderately Acidic): {zone_stats['Grey Zone (Moderately Acidic)']} villages")
-        print(f"   - Low pH: {zone_stats['Low pH']} villages")
-        print(f"   - Total Updated: {updated_villages_count} villages")
+        print_soil_ph_summary(updated_villages_count, zone_stats)
         
     except IOError as e:
         print(f"Error writing to file {file_path}: {e}")
@@ -4,11 +4,40 @@ Update villages data with real coordinates and proper nitrogen values
 """
 
 import json
-import random
-import math
+import os
+import zlib
+
+import numpy as np
+
+# Seeded once per run so re-runs reproduce the same coordinates (override with SOIL_SEED)
+RNG = np.random.default_rng(int(os.environ.get('SOIL_SEED', '42')))
+
+# Nitrogen categorization: Low < 280 <= Low-Medium < 400 <= Medium < 500 <= High
+NITROGEN_THRESHOLDS = np.array([280, 400, 500])
+NITROGEN_LEVELS = ("Low", "Low-Medium", "Medium", "High")
+NITROGEN_HALF_WIDTH = np.array([30, 40, 50, 60], dtype=np.float64)
+
+def village_name_hashes(village_names):
+    """CRC32 of each village name (stable across runs, unlike the salted str hash())"""
+    return np.fromiter(
+        (zlib.crc32(name.encode('utf-8')) for name in village_names), dtype=np.int64, count=len(village_names)
+    )
+
+def generate_realistic_coordinates(name_hashes, populations, rng=None):
+    """
+    Generate realistic coordinates within Kanker district bounds, for all villages at once
+
+    Args:
+        name_hashes: Per-village name hashes (village_name_hashes)
+        populations: Per-village population array
+        rng: numpy Generator for the population noise (the module's seeded RNG if None)
+
+    Returns:
+        (n, 2) array of [lat, lon] rows
+    """
+    if rng is None:
+        rng = RNG
 
-def generate_realistic_coordinates(village_name, population, index):
-    """Generate realistic coordinates within Kanker district bounds"""
     # Base coordinates for Kanker district
     base_lat = 20.2739
     base_lon = 81.4912
@@ -18,55 +47,53 @@ def generate_realistic_coordinates(village_name, population, index):
     lon_range = 0.42  # 81.30 to 81.72
     
     # Use village name hash for consistent positioning
-    name_hash = hash(village_name) % 1000
+    name_hash = name_hashes % 1000
     
     # Generate coordinates based on village characteristics
     lat_offset = (name_hash / 1000) * lat_range - (lat_range / 2)
     lon_offset = ((name_hash * 7) % 1000 / 1000) * lon_range - (lon_range / 2)
     
     # Add some randomness based on population
-    pop_factor = min(population / 1000, 3)  # Cap at 3
-    lat_noise = (random.random() - 0.5) * 0.01 * pop_factor
-    lon_noise = (random.random() - 0.5) * 0.01 * pop_factor
+    pop_factor = np.minimum(populations / 1000, 3)  # Cap at 3
+    noise = (rng.random((len(populations), 2)) - 0.5) * 0.01 * pop_factor[:, None]
     
-    lat = base_lat + lat_offset + lat_noise
-    lon = base_lon + lon_offset + lon_noise
+    lat = base_lat + lat_offset + noise[:, 0]
+    lon = base_lon + lon_offset + noise[:, 1]
     
     # Ensure coordinates are within bounds
-    lat = max(20.24, min(20.53, lat))
-    lon = max(81.30, min(81.72, lon))
+    lat = np.clip(lat, 20.24, 20.53)
+    lon = np.clip(lon, 81.30, 81.72)
     
-    return [round(lat, 6), round(lon, 6)]
+    return np.round(np.column_stack((lat, lon)), 6)
+
+def calculate_nitrogen_level(populations, name_hashes):
+    """
+    Calculate nitrogen level based on population and location, for all villages at once
 
-def calculate_nitrogen_level(population, village_name):
-    """Calculate nitrogen level based on population and location"""
+    Returns:
+        (levels, range_strs) lists, one entry per village
+    """
     # Base nitrogen level
     base_nitrogen = 250
     
     # Population factor (larger villages tend to have better soil)
-    pop_factor = min(population / 1000, 2) * 50
+    pop_factor = np.minimum(populations / 1000, 2) * 50
     
     # Village name factor (some villages have better names for soil)
-    name_factor = (hash(village_name) % 100) * 2
+    name_factor = (name_hashes % 100) * 2
     
     # Calculate total nitrogen
     total_nitrogen = base_nitrogen + pop_factor + name_factor
     
     # Categorize nitrogen level
-    if total_nitrogen < 280:
-        level = "Low"
-        range_str = f"{int(total_nitrogen-30)}-{int(total_nitrogen+30)} kg/ha"
-    elif total_nitrogen < 400:
-        level = "Low-Medium"
-        range_str = f"{int(total_nitrogen-40)}-{int(total_nitrogen+40)} kg/ha"
-    elif total_nitrogen < 500:
-        level = "Medium"
-        range_str = f"{int(total_nitrogen-50)}-{int(total_nitrogen+50)} kg/ha"
-    else:
-        level = "High"
-        range_str = f"{int(total_nitrogen-60)}-{int(total_nitrogen+60)} kg/ha"
-    
-    return level, range_str
+    level_codes = np.digitize(total_nitrogen, NITROGEN_THRESHOLDS)
+    half_width = NITROGEN_HALF_WIDTH[level_codes]
+    range_lo = (total_nitrogen - half_width).astype(np.int64).tolist()
+    range_hi = (total_nitrogen + half_width).astype(np.int64).tolist()
+    
+    levels = [NITROGEN_LEVELS[code] for code in level_codes.tolist()]
+    range_strs = [f"{lo}-{hi} kg/ha" for lo, hi in zip(range_lo, range_hi)]
+    return levels, range_strs
 
 def update_villages_data():
     """Update all villages with coordinates and nitrogen data"""
@@ -75,30 +102,28 @@ def update_villages_data():
     with open('kanker_complete_soil_analysis_data.json', 'r', encoding='utf-8') as f:
         data = json.load(f)
     
+    # Coordinates and nitrogen levels for all villages at once
+    villages = data['village_wise_data']['villages']
+    populations = np.fromiter(
+        (village['population'] for village in villages), dtype=np.float64, count=len(villages)
+    )
+    name_hashes = village_name_hashes([village['village_name'] for village in villages])
+    coordinates = generate_realistic_coordinates(name_hashes, populations).tolist()
+    nitrogen_levels, nitrogen_ranges = calculate_nitrogen_level(populations, name_hashes)
+    size_labels = np.select([populations > 2000, populations > 1000], ["Large", "Medium"], "Small").tolist()
+    
     # Update each village
-    for i, village in enumerate(data['village_wise_data']['villages']):
-        village_name = village['village_name']
-        population = village['population']
-        
-        # Generate coordinates
-        coordinates = generate_realistic_coordinates(village_name, population, i)
-        
-        # Calculate nitrogen level
-        nitrogen_level, nitrogen_range = calculate_nitrogen_level(population, village_name)
-        
+    for village, village_coordinates, nitrogen_level, nitrogen_range, size_label in zip(
+        villages, coordinates, nitrogen_levels, nitrogen_ranges, size_labels
+    ):
         # Update village data
-        village['coordinates'] = coordinates
+        village['coordinates'] = village_coordinates
         village['tehsil'] = "Kanker"
         village['nitrogen_level'] = nitrogen_level
         village['estimated_nitrogen'] = nitrogen_range
         
         # Update status
-        if population > 2000:
-            village['status'] = f"Large village with {nitrogen_level.lower()} nitrogen"
-        elif population > 1000:
-            village['status'] = f"Medium village with {nitrogen_level.lower()} nitrogen"
-        else:
-            village['status'] = f"Small village with {nitrogen_level.lower()} nitrogen"
+        village['status'] = f"{size_label} village with {nitrogen_level.lower()} nitrogen"
     
     # Update overall statistics
     data['overall_statistics'] = {
@@ -5,77 +5,59 @@ Based on zone classification and realistic calculations
 """
 
 import json
-import random
-from math import radians, sin, cos, sqrt, atan2
-
-def calculate_distance(lat1, lon1, lat2, lon2):
-    """Calculate distance between two points in km using Haversine formula"""
-    R = 6371  # Radius of Earth in kilometers
-
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-
-    a = sin(dlat / 2)**2 + cos(lat1) * cos(lat2) * sin(dlon / 2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-
-    distance = R * c
-    return distance
+import numpy as np
+
+from json_io import load_json, save_json
+from zone_utils import village_coordinate_arrays, assign_zones
+
+# Define Zinc Zones with bounding boxes
+ZINC_ZONES_BBOX = {
+    "Green Zone (Sufficient Zinc)": {
+        "lat_range": (20.16, 20.33),
+        "lon_range": (81.15, 81.49),
+        "zinc_level_category": "Sufficient",
+        "zinc_range_ppm": (0.6, 2.0),
+        "color": "green",
+        "description": "Majority tehsil forest cover, natural vegetation with sufficient zinc"
+    },
+    "Red Zone Center-Southwest": {
+        "lat_range": (20.22, 20.26),
+        "lon_range": (81.17, 81.32),
+        "zinc_level_category": "Deficient",
+        "zinc_range_ppm": (0.2, 0.6),
+        "color": "red",
+        "description": "Center-southwest red cluster with deficient zinc"
+    },
+    "Red Zone Northeast": {
+        "lat_range": (20.30, 20.33),
+        "lon_range": (81.38, 81.49),
+        "zinc_level_category": "Deficient",
+        "zinc_range_ppm": (0.2, 0.6),
+        "color": "red",
+        "description": "Northeast borders red highlights with deficient zinc"
+    },
+    "Red Zone Northwest": {
+        "lat_range": (20.30, 20.33),
+        "lon_range": (81.15, 81.21),
+        "zinc_level_category": "Deficient",
+        "zinc_range_ppm": (0.2, 0.6),
+        "color": "red",
+        "description": "Northwest border red zone with deficient zinc"
+    }
+}
 
-def update_zinc_values():
+def apply_zinc(data, rng=None):
     """
-    Update zinc values for villages in kanker_complete_soil_analysis_data.json
-    based on defined zinc zones.
-    """
-    file_path = 'kanker_complete_soil_analysis_data.json'
+    Assign zinc zones and values to villages and add zinc statistics,
+    recommendations and data quality notes (mutates data in place, no I/O)
 
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print(f"Error: File not found at {file_path}")
-        return
-    except json.JSONDecodeError:
-        print(f"Error: Could not decode JSON from {file_path}")
-        return
-
-    # Define Zinc Zones with bounding boxes
-    zinc_zones_bbox = {
-        "Green Zone (Sufficient Zinc)": {
-            "lat_range": (20.16, 20.33),
-            "lon_range": (81.15, 81.49),
-            "zinc_level_category": "Sufficient",
-            "zinc_range_ppm": (0.6, 2.0),
-            "color": "green",
-            "description": "Majority tehsil forest cover, natural vegetation with sufficient zinc"
-        },
-        "Red Zone Center-Southwest": {
-            "lat_range": (20.22, 20.26),
-            "lon_range": (81.17, 81.32),
-            "zinc_level_category": "Deficient",
-            "zinc_range_ppm": (0.2, 0.6),
-            "color": "red",
-            "description": "Center-southwest red cluster with deficient zinc"
-        },
-        "Red Zone Northeast": {
-            "lat_range": (20.30, 20.33),
-            "lon_range": (81.38, 81.49),
-            "zinc_level_category": "Deficient",
-            "zinc_range_ppm": (0.2, 0.6),
-            "color": "red",
-            "description": "Northeast borders red highlights with deficient zinc"
-        },
-        "Red Zone Northwest": {
-            "lat_range": (20.30, 20.33),
-            "lon_range": (81.15, 81.21),
-            "zinc_level_category": "Deficient",
-            "zinc_range_ppm": (0.2, 0.6),
-            "color": "red",
-            "description": "Northwest border red zone with deficient zinc"
-        }
-    }
+    Args:
+        data: Soil analysis data with village_wise_data
+        rng: numpy Generator for the value draws (a fresh default_rng() if None)
 
+    Returns:
+        (updated_villages_count, zone_stats)
+    """
     updated_villages_count = 0
     zone_stats = {
         "Green Zone (Sufficient Zinc)": 0,
@@ -86,49 +68,37 @@ def update_zinc_values():
     }
     
     if 'village_wise_data' in data and 'villages' in data['village_wise_data']:
-        for village in data['village_wise_data']['villages']:
-            lat, lon = village.get('coordinates', [None, None])
-
-            if lat is None or lon is None:
-                # Skip if coordinates are missing
-                continue
-
-            assigned_zone = "Low Zinc"
-            zinc_level_category = "Low"
-            estimated_zinc_range = (0.3, 0.5) # Default Low
-
-            # Check for Red Zones first (more specific overlap)
-            red_zone_found = False
-            for zone_name, zone_info in zinc_zones_bbox.items():
-                if "Red Zone" in zone_name:
-                    if (zone_info["lat_range"][0] <= lat <= zone_info["lat_range"][1] and
-                        zone_info["lon_range"][0] <= lon <= zone_info["lon_range"][1]):
-                        assigned_zone = zone_name
-                        zinc_level_category = zone_info["zinc_level_category"]
-                        estimated_zinc_range = zone_info["zinc_range_ppm"]
-                        zone_stats[zone_name] += 1
-                        red_zone_found = True
-                        break
-            
-            # If not in red zone, check for Green Zone
-            if not red_zone_found:
-                if (zinc_zones_bbox["Green Zone (Sufficient Zinc)"]["lat_range"][0] <= lat <= zinc_zones_bbox["Green Zone (Sufficient Zinc)"]["lat_range"][1] and
-                    zinc_zones_bbox["Green Zone (Sufficient Zinc)"]["lon_range"][0] <= lon <= zinc_zones_bbox["Green Zone (Sufficient Zinc)"]["lon_range"][1]):
-                    assigned_zone = "Green Zone (Sufficient Zinc)"
-                    zinc_level_category = zinc_zones_bbox["Green Zone (Sufficient Zinc)"]["zinc_level_category"]
-                    estimated_zinc_range = zinc_zones_bbox["Green Zone (Sufficient Zinc)"]["zinc_range_ppm"]
-                    zone_stats["Green Zone (Sufficient Zinc)"] += 1
-                else:
-                    zone_stats["Low Zinc"] += 1
-            
-            # Assign zinc values
-            min_zn, max_zn = estimated_zinc_range
-            estimated_zinc = round(random.uniform(min_zn, max_zn), 3)
+        villages, lat, lon = village_coordinate_arrays(data['village_wise_data']['villages'])
+
+        # Zone codes in priority order: Red Zones first (more specific overlap), then Green, else Low
+        zone_names = tuple(name for name in ZINC_ZONES_BBOX if "Red Zone" in name) + ("Green Zone (Sufficient Zinc)",)
+        zone_codes = assign_zones(lat, lon, [ZINC_ZONES_BBOX[name] for name in zone_names])
+
+        # Per-code level category and zinc range, the last entry being the Low default
+        categories = [ZINC_ZONES_BBOX[name]["zinc_level_category"] for name in zone_names] + ["Low"]
+        ranges = np.array([ZINC_ZONES_BBOX[name]["zinc_range_ppm"] for name in zone_names] + [(0.3, 0.5)])
+        names = zone_names + ("Low Zinc",)
+
+        # Assign zinc values, one Generator draw and one formatting call for all villages
+        if rng is None:
+            rng = np.random.default_rng()
+        estimated_zinc = rng.uniform(ranges[zone_codes, 0], ranges[zone_codes, 1])
+        estimated_zinc_text = np.char.mod("%.3f ppm", estimated_zinc).tolist()
+
+        # Status sentence tail per zone code; only the village name varies within a zone
+        status_suffixes = [f" has {category} zinc in {name}." for category, name in zip(categories, names)]
+
+        for code, count in enumerate(np.bincount(zone_codes, minlength=len(names)).tolist()):
+            zone_stats[names[code]] = count
+
+        for village, code, value in zip(villages, zone_codes.tolist(), estimated_zinc_text):
+            assigned_zone = names[code]
+            zinc_level_category = categories[code]
 
             village['zinc_level'] = zinc_level_category
-            village['estimated_zinc'] = f"{estimated_zinc:.3f} ppm"
+            village['estimated_zinc'] = value
             village['zinc_zone'] = assigned_zone
-            village['zinc_status'] = f"{village['village_name']} has {zinc_level_category} zinc in {assigned_zone}."
+            village['zinc_status'] = village['village_name'] + status_suffixes[code]
             updated_villages_count += 1
 
     # Update overall statistics and recommendations for zinc
@@ -203,18 +173,41 @@ def update_zinc_values():
     data['data_quality']['zinc_zones'] = "Based on provided Green Zone and Red Zone coordinates"
     data['data_quality']['zinc_calculation_method'] = "Bounding box zone assignment + Realistic zinc ranges (DTPA Extractable Zinc)"
 
+    return updated_villages_count, zone_stats
+
+def print_zinc_summary(updated_villages_count, zone_stats):
+    """Print the zinc zone distribution returned by apply_zinc"""
+    print(f"\n📊 Zinc Zone Distribution:")
+    print(f"   - Green Zone (Sufficient): {zone_stats['Green Zone (Sufficient Zinc)']} villages")
+    print(f"   - Red Zone Center-Southwest: {zone_stats['Red Zone Center-Southwest']} villages")
+    print(f"   - Red Zone Northeast: {zone_stats['Red Zone Northeast']} villages")
+    print(f"   - Red Zone Northwest: {zone_stats['Red Zone Northwest']} villages")
+    print(f"   - Low Zinc: {zone_stats['Low Zinc']} villages")
+    print(f"   - Total Updated: {updated_villages_count} villages")
+
+def update_zinc_values():
+    """
+    Update zinc values for villages in kanker_complete_soil_analysis_data.json
+    based on defined zinc zones.
+    """
+    file_path = 'kanker_complete_soil_analysis_data.json'
+
+    try:
+        data = load_json(file_path)
+    except FileNotFoundError:
+        print(f"Error: File not found at {file_path}")
+        return
+    except json.JSONDecodeError:
+        print(f"Error: Could not decode JSON from {file_path}")
+        return
+
+    updated_villages_count, zone_stats = apply_zinc(data)
+
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        save_json(file_path, data)
         
         print(f"✅ Successfully updated zinc values for {updated_villages_count} villages in {file_path}")
-        print(f"\n📊 Zinc Zone Distribution:")
-        print(f"   - Green Zone (Sufficient): {zone_stats['Green Zone (Sufficient Zinc)']} villages")
-        print(f"   - Red Zone Center-Southwest: {zone_stats['Red Zone Center-Southwest']} villages")
-        print(f"   - Red Zone Northeast: {zone_stats['Red Zone Northeast']} villages")
-        print(f"   - Red Zone Northwest: {zone_stats['Red Zone Northwest']} villages")
-        print(f"   - Low Zinc: {zone_stats['Low Zinc']} villages")
-        print(f"   - Total Updated: {updated_villages_count} villages")
+        print_zinc_summary(updated_villages_count, zone_stats)
         
     except IOError as e:
         print(f"Error writing to file {file_path}: {e}")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the Kanker nutrient update scripts
+Vectorized (NumPy) bounding-box zone assignment over village coordinates,
+through a grid of zone edges so each point is one lookup whatever the zone count
+"""
+
+import hashlib
+import json
+
+import numpy as np
+
+def village_coordinate_arrays(villages):
+    """
+    Collect the villages that have coordinates, with lat/lon as arrays
+
+    Returns:
+        (located_villages, lat, lon) with lat[i], lon[i] belonging to located_villages[i]
+    """
+    located_villages = []
+    for village in villages:
+        lat, lon = village.get('coordinates', [None, None])
+
+        if lat is None or lon is None:
+            # Skip if coordinates are missing
+            continue
+
+        located_villages.append(village)
+
+    coords = np.array(
+        [village['coordinates'] for village in located_villages], dtype=np.float64
+    ).reshape(-1, 2)
+    return located_villages, coords[:, 0], coords[:, 1]
+
+def bbox_mask(lat, lon, zone):
+    """Boolean mask of the points inside a zone's lat_range/lon_range (inclusive)"""
+    lat_lo, lat_hi = zone["lat_range"]
+    lon_lo, lon_hi = zone["lon_range"]
+    return (lat >= lat_lo) & (lat <= lat_hi) & (lon >= lon_lo) & (lon <= lon_hi)
+
+def _scan_zones(lat, lon, zones):
+    """Zone codes by testing every zone's bounding box (O(points x zones))"""
+    codes = np.full(np.broadcast(lat, lon).shape, len(zones), dtype=np.int8)
+
+    # Lowest priority first so higher-priority zones overwrite overlaps
+    for code in range(len(zones) - 1, -1, -1):
+        codes[bbox_mask(lat, lon, zones[code])] = code
+
+    return codes
+
+def _grid_axis(bounds):
+    """
+    Sorted unique zone edges along one axis, plus one representative coordinate per grid cell
+
+    Cells alternate between the open gaps and the edges themselves:
+    (-inf, e0), e0, (e0, e1), e1, ..., e_last, (e_last, inf), so inclusive
+    bounding boxes stay exact (no fixed-resolution rounding at the edges).
+    """
+    edges = np.unique(np.asarray(bounds, dtype=np.float64))
+    cell_points = np.empty(2 * len(edges) + 1)
+    cell_points[1::2] = edges
+    cell_points[2:-1:2] = (edges[:-1] + edges[1:]) / 2
+    cell_points[0] = edges[0] - 1.0
+    cell_points[-1] = edges[-1] + 1.0
+    return edges, cell_points
+
+def _grid_cells(edges, values):
+    """Grid cell index along one axis for each value"""
+    idx = np.searchsorted(edges, values, side='left')
+    on_edge = edges[np.minimum(idx, len(edges) - 1)] == values
+    return 2 * idx + on_edge
+
+def build_zone_grid(zones):
+    """
+    Rasterize zone bounding boxes into a grid of winning zone codes
+
+    Args:
+        zones: Zone definitions with lat_range/lon_range, highest priority first
+
+    Returns:
+        (lat_edges, lon_edges, grid) for lookup_zone_grid; grid cells hold the
+        zone index, len(zones) outside every zone
+    """
+    lat_edges, lat_points = _grid_axis([zone["lat_range"] for zone in zones])
+    lon_edges, lon_points = _grid_axis([zone["lon_range"] for zone in zones])
+    grid = _scan_zones(lat_points[:, None], lon_points[None, :], zones)
+    return lat_edges, lon_edges, grid
+
+def lookup_zone_grid(zone_grid, lat, lon):
+    """Zone code per point from a build_zone_grid result (no per-zone scan)"""
+    lat_edges, lon_edges, grid = zone_grid
+    return grid[_grid_cells(lat_edges, lat), _grid_cells(lon_edges, lon)]
+
+def assign_zones(lat, lon, zones):
+    """
+    Assign every point to the first zone (in priority order) whose bounding box contains it
+
+    Args:
+        lat, lon: Coordinate arrays
+        zones: Zone definitions with lat_range/lon_range, highest priority first
+
+    Returns:
+        int8 array of zone indices; len(zones) for points outside every zone
+    """
+    if not zones:
+        return np.full(np.broadcast(lat, lon).shape, 0, dtype=np.int8)
+
+    return lookup_zone_grid(build_zone_grid(zones), lat, lon)
+
+def zone_inputs_digest(zones, lat, lon):
+    """Content hash (BLAKE2b) of zone definitions and village coordinates"""
+    digest = hashlib.blake2b(json.dumps(zones, sort_keys=True).encode('utf-8'))
+    digest.update(np.ascontiguousarray(lat, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(lon, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+def sections_present(data, section_keys):
+    """
+    True if every key a script writes into the document-level sections is still there
+
+    Args:
+        data: Soil analysis data
+        section_keys: {section name: keys the script owns in that section}
+    """
+    return all(
+        key in data.get(section, {}) for section, keys in section_keys.items() for key in keys
+    )
+
+def read_digest(cache_path):
+    """Digest stored by write_digest, or None if there is none"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+def write_digest(cache_path, digest):
+    """Store a digest next to the data it describes"""
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        f.write(digest)